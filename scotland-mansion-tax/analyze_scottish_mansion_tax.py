@@ -132,9 +132,10 @@ def analyze():
     print(f"{'Council':<30} {'Sales':>8} {'Share':>8} {'Revenue':>12}")
     print("-" * 70)
 
-    for _, row in df.head(15).iterrows():
-        print(f"{row['council']:<30} {row['total_sales_1m_plus']:>8} "
-              f"{row['share_pct']:>7.1f}% £{row['allocated_revenue']/1e6:>9.2f}m")
+    table_cols = ['council', 'total_sales_1m_plus', 'share_pct', 'allocated_revenue']
+    for council, sales, share, revenue in df.head(15)[table_cols].itertuples(index=False, name=None):
+        print(f"{council:<30} {sales:>8} "
+              f"{share:>7.1f}% £{revenue/1e6:>9.2f}m")
 
     print("-" * 70)
     print(f"{'TOTAL':<30} {df['total_sales_1m_plus'].sum():>8} "
@@ -157,9 +158,10 @@ def main():
     print(f"  - {df['total_sales_1m_plus'].sum()} total £1m+ sales (2024)")
     print(f"  - £{df['allocated_revenue'].sum()/1e6:.0f}m total allocated revenue")
     print(f"\nTop 5 councils by impact:")
-    for _, row in df.head(5).iterrows():
-        print(f"  {row['council']}: {row['total_sales_1m_plus']} sales, "
-              f"£{row['allocated_revenue']/1e6:.2f}m ({row['share_pct']:.1f}%)")
+    summary_cols = ['council', 'total_sales_1m_plus', 'allocated_revenue', 'share_pct']
+    for council, sales, revenue, share in df.head(5)[summary_cols].itertuples(index=False, name=None):
+        print(f"  {council}: {sales} sales, "
+              f"£{revenue/1e6:.2f}m ({share:.1f}%)")
 
     print(f"\nGenerated: {output_file}")
     print("=" * 70)
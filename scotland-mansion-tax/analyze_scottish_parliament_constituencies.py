@@ -41,6 +41,8 @@ Methodology:
 5. Allocate £18.5m proportionally by each constituency's share of sales
 """
 
+import functools
+
 import pandas as pd
 from pathlib import Path
 
@@ -254,14 +256,40 @@ EXPECTED_CONSTITUENCIES = 73
 assert len(CONSTITUENCY_COUNCIL_MAPPING) == EXPECTED_CONSTITUENCIES, \
     f"Expected {EXPECTED_CONSTITUENCIES} constituencies, got {len(CONSTITUENCY_COUNCIL_MAPPING)}"
 
+# Validate every mapped council has sales data (checked once here, not per row)
+_unknown_councils = frozenset(CONSTITUENCY_COUNCIL_MAPPING.values()) - frozenset(COUNCIL_DATA)
+assert not _unknown_councils, f"Councils missing from COUNCIL_DATA: {sorted(_unknown_councils)}"
+
+# Series forms of the lookups above, built once at import. Councils are a
+# categorical so council groupbys and maps operate on integer codes.
+COUNCIL_DTYPE = pd.CategoricalDtype(list(COUNCIL_DATA))
+COUNCIL_SALES = pd.Series(COUNCIL_DATA, name='council_sales').rename_axis('council')
+CONSTITUENCY_TO_COUNCIL = pd.Series(
+    CONSTITUENCY_COUNCIL_MAPPING, dtype=COUNCIL_DTYPE, name='council'
+).rename_axis('constituency')
+
 # Band distribution (from Savills 2024 data)
 # Source: https://www.savills.co.uk/research_articles/229130/372275-0
 # 2024: 416 sales £1m-£2m, 50 sales £2m+ (total 466)
 BAND_I_RATIO = 416 / 466  # £1m-£2m = 89.3%
 BAND_J_RATIO = 50 / 466   # £2m+ = 10.7%
 
+# Total revenue using simple formula: Stock × Average Rate
+# This is equivalent to: (sales × avg_rate) × (stock / sales) = stock × avg_rate
+AVG_RATE = BAND_I_RATIO * BAND_I_SURCHARGE + BAND_J_RATIO * BAND_J_SURCHARGE
+TOTAL_STOCK_REVENUE = ESTIMATED_STOCK * AVG_RATE  # 11,481 × £1,607 = £18.5m
+
+# Columns written to the constituency impact CSV, in order
+OUTPUT_COLUMNS = [
+    'constituency', 'council', 'population', 'wealth_factor', 'weight',
+    'estimated_sales', 'band_i_sales', 'band_j_sales', 'share_pct',
+    'implied_from_sales', 'allocated_revenue',
+]
+
+
 def download_council_tax_data():
     """Download Council Tax Band data from statistics.gov.scot SPARQL endpoint."""
+    import shutil
     import urllib.request
     import urllib.parse
 
@@ -291,18 +319,24 @@ ORDER BY ?constituency ?band
     endpoint = "https://statistics.gov.scot/sparql.csv"
     url = f"{endpoint}?query={urllib.parse.quote(sparql_query)}"
 
+    band_file = Path("data/council_tax_bands_by_constituency.csv")
+    band_file.parent.mkdir(exist_ok=True)
+    part_file = band_file.with_suffix('.csv.part')
+
     print("   Downloading from statistics.gov.scot...")
     try:
-        with urllib.request.urlopen(url, timeout=60) as response:
-            data = response.read().decode('utf-8')
-
-        # Save to file
-        band_file = Path("data/council_tax_bands_by_constituency.csv")
-        band_file.parent.mkdir(exist_ok=True)
-        band_file.write_text(data)
-        print(f"   ✓ Downloaded and saved {len(data.splitlines())} rows")
+        # Stream straight to disk rather than holding the decoded CSV in memory.
+        # Write to a temporary file so a failed download never leaves a partial CSV.
+        with urllib.request.urlopen(url, timeout=60) as response, open(part_file, 'wb') as f:
+            shutil.copyfileobj(response, f, length=1 << 20)
+        part_file.replace(band_file)
+
+        with open(band_file, 'rb') as f:
+            n_rows = sum(1 for _ in f)
+        print(f"   ✓ Downloaded and saved {n_rows} rows")
         return True
     except Exception as e:
+        part_file.unlink(missing_ok=True)
         print(f"   ⚠️ Download failed: {e}")
         return False
 
@@ -314,12 +348,21 @@ def load_wealth_factors():
 
     Source: statistics.gov.scot (2023)
 
+    The CSV is parsed once per process; repeat calls return a fresh dict
+    built from the cached result.
+
     Returns:
         Dict mapping constituency -> wealth factor.
 
     Raises:
         RuntimeError: If required data files cannot be downloaded.
     """
+    return dict(_load_wealth_factors_cached())
+
+
+@functools.lru_cache(maxsize=1)
+def _load_wealth_factors_cached():
+    """Parse the Band F-H data into (constituency, wealth factor) pairs."""
     band_file = Path("data/council_tax_bands_by_constituency.csv")
 
     # Download if not present - fail if unavailable
@@ -333,50 +376,62 @@ def load_wealth_factors():
             )
 
     # Load the data
-    df = pd.read_csv(band_file)
+    df = pd.read_csv(
+        band_file,
+        usecols=['constituency', 'band', 'dwellings'],
+        dtype={'constituency': 'string', 'band': 'category', 'dwellings': 'int64'},
+    )
 
     # Pivot to get Band F-H and Total for each constituency
-    df_fh = df[df['band'] == 'Bands F-H'][['constituency', 'dwellings']].copy()
-    df_fh.columns = ['constituency', 'band_fh']
-
-    df_total = df[df['band'] == 'Total Dwellings'][['constituency', 'dwellings']].copy()
-    df_total.columns = ['constituency', 'total']
-
-    # Merge and calculate percentages
-    df_merged = df_fh.merge(df_total, on='constituency')
-    df_merged['fh_pct'] = df_merged['band_fh'] / df_merged['total']
+    df = df[df['band'].isin(['Bands F-H', 'Total Dwellings'])]
+    wide = df.pivot(index='constituency', columns='band', values='dwellings')
+    band_counts = (
+        wide[['Bands F-H', 'Total Dwellings']]
+        .dropna()
+        .rename(columns={'Bands F-H': 'band_fh', 'Total Dwellings': 'total'})
+        .rename_axis(columns=None)
+        .astype('int64')
+    )
+    band_counts['fh_pct'] = band_counts['band_fh'] / band_counts['total']
 
     # Calculate Scotland average Band F-H percentage
-    scotland_fh = df_merged['band_fh'].sum()
-    scotland_total = df_merged['total'].sum()
+    scotland_fh = band_counts['band_fh'].sum()
+    scotland_total = band_counts['total'].sum()
     scotland_avg_pct = scotland_fh / scotland_total
 
     print(f"   Scotland average Band F-H: {scotland_avg_pct:.1%} ({scotland_fh:,} of {scotland_total:,} dwellings)")
 
     # Calculate wealth factor for each constituency
     # Factor = constituency Band F-H % / Scotland average Band F-H %
-    wealth_factors = {}
-    for _, row in df_merged.iterrows():
-        factor = row['fh_pct'] / scotland_avg_pct
-        wealth_factors[row['constituency']] = round(factor, 2)
+    fh_pct_by_name = band_counts['fh_pct']
+    wealth_factors = (fh_pct_by_name / scotland_avg_pct).round(2).to_dict()
 
     # Print top and bottom constituencies for verification
     sorted_factors = sorted(wealth_factors.items(), key=lambda x: x[1], reverse=True)
     print(f"   Top 5 by Band F-H concentration:")
     for name, factor in sorted_factors[:5]:
-        pct = df_merged[df_merged['constituency'] == name]['fh_pct'].values[0]
+        pct = fh_pct_by_name[name]
         print(f"      {name}: {factor:.2f}x ({pct:.1%} Band F-H)")
 
     print(f"   Bottom 3 by Band F-H concentration:")
     for name, factor in sorted_factors[-3:]:
-        pct = df_merged[df_merged['constituency'] == name]['fh_pct'].values[0]
+        pct = fh_pct_by_name[name]
         print(f"      {name}: {factor:.2f}x ({pct:.1%} Band F-H)")
 
-    return wealth_factors
+    return tuple(wealth_factors.items())
 
 
 def load_population_data():
-    """Load NRS constituency population data."""
+    """Load NRS constituency population data.
+
+    The CSV is read once per process; each call returns a copy of the cached frame.
+    """
+    return _load_population_data_cached().copy()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_population_data_cached():
+    """Read (extracting from the NRS Excel file if needed) the population CSV."""
     pop_file = Path("data/constituency_population.csv")
 
     if not pop_file.exists():
@@ -386,11 +441,13 @@ def load_population_data():
         # Extract from Excel if CSV doesn't exist
         xlsx_file = Path("data/nrs_constituency_population.xlsx")
         if xlsx_file.exists():
-            df = pd.read_excel(xlsx_file, sheet_name='2021', skiprows=2)
-            df.columns = ['constituency', 'code', 'sex', 'total'] + [f'age_{i}' for i in range(len(df.columns)-4)]
-            df_pop = df[df['sex'] == 'Persons'][['constituency', 'total']].copy()
+            # Only the first four columns are needed; skip the single-year-of-age columns
+            df = pd.read_excel(
+                xlsx_file, sheet_name='2021', skiprows=2, usecols=[0, 1, 2, 3],
+                names=['constituency', 'code', 'sex', 'total'], engine='openpyxl',
+            )
+            df_pop = df.loc[df['sex'] == 'Persons', ['constituency', 'total']].dropna()
             df_pop.columns = ['constituency', 'population']
-            df_pop = df_pop.dropna()
             df_pop['population'] = df_pop['population'].astype(int)
             df_pop.to_csv(pop_file, index=False)
             print(f"   ✓ Saved {len(df_pop)} constituencies to {pop_file}")
@@ -411,47 +468,39 @@ def calculate_wealth_adjusted_weights(population_df, wealth_factors):
     Args:
         population_df: DataFrame with constituency populations
         wealth_factors: Dict mapping constituency -> wealth factor (from Band F-H data)
-    """
-
-    # Create mapping with population
-    weights = {}
-
-    # Group constituencies by council with adjusted values
-    council_data = {}
-    for constituency, council in CONSTITUENCY_COUNCIL_MAPPING.items():
-        if council not in council_data:
-            council_data[council] = []
 
-        # Find population for this constituency
-        pop_row = population_df[population_df['constituency'] == constituency]
-        if len(pop_row) == 0:
-            raise ValueError(f"No population data for {constituency}")
-        pop = pop_row['population'].values[0]
+    Returns:
+        DataFrame with constituency, council, population, wealth_factor and weight
+        columns, one row per constituency in mapping order.
+    """
 
-        # Get wealth adjustment factor
-        if constituency not in wealth_factors:
-            raise ValueError(f"No wealth factor for {constituency}")
-        wealth_factor = wealth_factors[constituency]
+    constituencies = frozenset(CONSTITUENCY_COUNCIL_MAPPING)
+    missing_pop = constituencies - frozenset(population_df['constituency'])
+    if missing_pop:
+        raise ValueError(f"No population data for {', '.join(sorted(missing_pop))}")
+    missing_wf = constituencies - frozenset(wealth_factors)
+    if missing_wf:
+        raise ValueError(f"No wealth factor for {', '.join(sorted(missing_wf))}")
 
-        # Adjusted value = population × wealth factor
-        adjusted_value = pop * wealth_factor
+    # One row per constituency, in mapping order
+    df = CONSTITUENCY_TO_COUNCIL.reset_index()
+    wf = pd.Series(wealth_factors, name='wealth_factor').rename_axis('constituency')
+    df = df.merge(population_df[['constituency', 'population']], on='constituency', how='left')
+    df = df.merge(wf.reset_index(), on='constituency', how='left')
 
-        council_data[council].append((constituency, pop, wealth_factor, adjusted_value))
+    # Adjusted value = population × wealth factor
+    df['adjusted'] = df['population'] * df['wealth_factor']
 
-    # Calculate weights within each council using adjusted values
-    for council, constituencies in council_data.items():
-        total_adjusted = sum(adj for _, _, _, adj in constituencies)
-        for constituency, pop, wealth_factor, adjusted_value in constituencies:
-            # Weight based on adjusted value, not raw population
-            weight = adjusted_value / total_adjusted if total_adjusted > 0 else 1 / len(constituencies)
-            weights[constituency] = {
-                "council": council,
-                "population": pop,
-                "wealth_factor": wealth_factor,
-                "weight": weight
-            }
+    # Weight based on adjusted value, not raw population; fall back to an
+    # even split for councils whose adjusted total is zero
+    council_groups = df.groupby('council', sort=False, observed=True)['adjusted']
+    total_adjusted = council_groups.transform('sum')
+    council_size = council_groups.transform('size')
+    df['weight'] = (df['adjusted'] / total_adjusted).where(
+        total_adjusted > 0, 1 / council_size
+    )
 
-    return weights
+    return df[['constituency', 'council', 'population', 'wealth_factor', 'weight']]
 
 
 def analyze_constituencies():
@@ -479,59 +528,28 @@ def analyze_constituencies():
     # Calculate total sales for normalization
     total_sales = sum(COUNCIL_DATA.values())
 
-    results = []
-
-    for constituency, data in weights.items():
-        council = data["council"]
-        weight = data["weight"]
-        population = data["population"]
-        wealth_factor = data["wealth_factor"]
-
-        # Get council's total sales
-        if council not in COUNCIL_DATA:
-            raise ValueError(f"Council {council} not in COUNCIL_DATA")
-        council_sales = COUNCIL_DATA[council]
-
-        # Allocate to constituency based on wealth-adjusted weight
-        constituency_sales = council_sales * weight
-
-        # Calculate share of total
-        share = constituency_sales / total_sales if total_sales > 0 else 0
-
-        # Band breakdown
-        band_i_sales = constituency_sales * BAND_I_RATIO
-        band_j_sales = constituency_sales * BAND_J_RATIO
-
-        # Calculate implied revenue from sales using UK rates
-        implied_from_sales = (band_i_sales * BAND_I_SURCHARGE) + (band_j_sales * BAND_J_SURCHARGE)
-
-        results.append({
-            "constituency": constituency,
-            "council": council,
-            "population": population,
-            "wealth_factor": wealth_factor,
-            "weight": round(weight, 4),
-            "estimated_sales": constituency_sales,
-            "band_i_sales": band_i_sales,
-            "band_j_sales": band_j_sales,
-            "share_pct": round(share * 100, 2) if constituency_sales > 0 else 0,
-            "implied_from_sales": implied_from_sales if constituency_sales > 0 else 0,
-        })
-
-    df = pd.DataFrame(results)
-    df = df.sort_values("estimated_sales", ascending=False)
+    df = weights.copy()
 
-    # Calculate total revenue using simple formula: Stock × Average Rate
-    # This is equivalent to: (sales × avg_rate) × (stock / sales) = stock × avg_rate
-    avg_rate = BAND_I_RATIO * BAND_I_SURCHARGE + BAND_J_RATIO * BAND_J_SURCHARGE
-    total_stock_revenue = ESTIMATED_STOCK * avg_rate  # 11,481 × £1,607 = £18.5m
+    # Allocate council sales to constituency based on wealth-adjusted weight
+    # (every mapped council is validated against COUNCIL_DATA at import)
+    df['estimated_sales'] = df['council'].map(COUNCIL_SALES).astype('float64') * df['weight']
+    df['weight'] = df['weight'].round(4)
 
-    # For reference: the ratio-based calculation gives the same result
-    total_implied_from_sales = df['implied_from_sales'].sum()
-    stock_sales_ratio = ESTIMATED_STOCK / total_sales
+    # Band breakdown
+    df['band_i_sales'] = df['estimated_sales'] * BAND_I_RATIO
+    df['band_j_sales'] = df['estimated_sales'] * BAND_J_RATIO
+
+    # Share of total, and implied revenue from sales using UK rates
+    # (total_sales > 0 is asserted at import)
+    df['share_pct'] = (df['estimated_sales'] / total_sales * 100).round(2)
+    df['implied_from_sales'] = (
+        df['band_i_sales'] * BAND_I_SURCHARGE + df['band_j_sales'] * BAND_J_SURCHARGE
+    )
+
+    df = df.sort_values("estimated_sales", ascending=False)
 
     # Allocate total revenue proportionally by each constituency's share
-    df['allocated_revenue'] = df['share_pct'] / 100 * total_stock_revenue
+    df['allocated_revenue'] = df['share_pct'] / 100 * TOTAL_STOCK_REVENUE
 
     # Print summary
     print(f"\n📊 Total constituencies: {len(df)}")
@@ -540,19 +558,20 @@ def analyze_constituencies():
     print(f"\n💰 Revenue calculation:")
     print(f"   Band I rate: £{BAND_I_SURCHARGE:,}/year ({BAND_I_RATIO:.1%} of properties)")
     print(f"   Band J rate: £{BAND_J_SURCHARGE:,}/year ({BAND_J_RATIO:.1%} of properties)")
-    print(f"   Average rate: £{avg_rate:,.0f}/year")
-    print(f"   Formula: Stock × Avg Rate = {ESTIMATED_STOCK:,} × £{avg_rate:,.0f} = £{total_stock_revenue/1e6:.1f}m")
+    print(f"   Average rate: £{AVG_RATE:,.0f}/year")
+    print(f"   Formula: Stock × Avg Rate = {ESTIMATED_STOCK:,} × £{AVG_RATE:,.0f} = £{TOTAL_STOCK_REVENUE/1e6:.1f}m")
 
     print("\n🏛️  Top 20 Constituencies by Impact:")
     print("-" * 105)
     print(f"{'Constituency':<40} {'Council':<20} {'Pop':>8} {'Weight':>7} {'Sales':>6} {'Revenue':>12}")
     print("-" * 105)
 
-    for _, row in df.head(20).iterrows():
-        council_short = row['council'][:19] if len(row['council']) > 19 else row['council']
-        print(f"{row['constituency']:<40} {council_short:<20} "
-              f"{row['population']:>8,} {row['weight']:>6.1%} "
-              f"{row['estimated_sales']:>6} £{row['allocated_revenue']/1e6:>10.2f}m")
+    top_cols = ['constituency', 'council', 'population', 'weight', 'estimated_sales', 'allocated_revenue']
+    for name, council, pop, weight, sales, revenue in df.head(20)[top_cols].itertuples(index=False, name=None):
+        council_short = council[:19] if len(council) > 19 else council
+        print(f"{name:<40} {council_short:<20} "
+              f"{pop:>8,} {weight:>6.1%} "
+              f"{sales:>6} £{revenue/1e6:>10.2f}m")
 
     print("-" * 105)
 
@@ -563,9 +582,11 @@ def analyze_constituencies():
           f"£{edinburgh_df['allocated_revenue'].sum()/1e6:.1f}m "
           f"({edinburgh_df['share_pct'].sum():.1f}%)")
 
-    for _, row in edinburgh_df.sort_values('estimated_sales', ascending=False).iterrows():
-        print(f"   - {row['constituency']}: {row['estimated_sales']} sales, "
-              f"£{row['allocated_revenue']/1e6:.2f}m ({row['share_pct']:.1f}%)")
+    summary_cols = ['constituency', 'estimated_sales', 'allocated_revenue', 'share_pct']
+    edinburgh_sorted = edinburgh_df.sort_values('estimated_sales', ascending=False)
+    for name, sales, revenue, share in edinburgh_sorted[summary_cols].itertuples(index=False, name=None):
+        print(f"   - {name}: {sales} sales, "
+              f"£{revenue/1e6:.2f}m ({share:.1f}%)")
 
     return df
 
@@ -576,7 +597,13 @@ def main():
 
     # Save results
     output_file = "scottish_parliament_constituency_impact.csv"
-    df.to_csv(output_file, index=False)
+    df.to_csv(
+        output_file,
+        index=False,
+        columns=OUTPUT_COLUMNS,
+        float_format='%.4f',
+        lineterminator='\n',
+    )
     print(f"\n✅ Saved: {output_file}")
 
     # Summary stats
@@ -588,9 +615,10 @@ def main():
     print(f"  Estimated stock: {ESTIMATED_STOCK:,}")
     print(f"  Stock-based revenue: £{df['allocated_revenue'].sum()/1e6:.1f}m")
     print(f"\n  Top 5 constituencies:")
-    for _, row in df.head(5).iterrows():
-        print(f"    {row['constituency']}: {row['estimated_sales']} sales, "
-              f"£{row['allocated_revenue']/1e6:.2f}m ({row['share_pct']:.1f}%)")
+    summary_cols = ['constituency', 'estimated_sales', 'allocated_revenue', 'share_pct']
+    for name, sales, revenue, share in df.head(5)[summary_cols].itertuples(index=False, name=None):
+        print(f"    {name}: {sales} sales, "
+              f"£{revenue/1e6:.2f}m ({share:.1f}%)")
     print("=" * 70)
 
     return df
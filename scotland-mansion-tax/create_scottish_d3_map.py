@@ -7,48 +7,429 @@ Budget 2026-27 council tax reform for £1m+ properties, distributed to the 73 Sc
 Parliament constituencies.
 """
 
+import gzip
+import hashlib
 import json
+import math
 import pandas as pd
+from collections import defaultdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+GEOJSON_FILE = 'data/scottish_parliament_constituencies.geojson'
+IMPACT_FILE = 'scottish_parliament_constituency_impact.csv'
+OUTPUT_FILE = 'scottish_mansion_tax_map.html'
+DATA_FILE = 'scottish_mansion_tax_data.json'
+
+# Douglas-Peucker tolerance in British National Grid metres. At the 600x900
+# viewBox one pixel is roughly 900m, so 50m stays sub-pixel even at 8x zoom.
+SIMPLIFY_TOLERANCE = 50.0
+
+# SVG viewBox the boundaries are projected into
+MAP_WIDTH = 600
+MAP_HEIGHT = 900
+MAP_PADDING = 20
+
+# The page only uses d3's selection, transitions and zoom behaviour, so it
+# loads those UMD modules (dependencies first) instead of the full d3 bundle
+D3_MODULES = (
+    'd3-dispatch@3', 'd3-selection@3', 'd3-color@3', 'd3-interpolate@3',
+    'd3-ease@3', 'd3-timer@3', 'd3-transition@3', 'd3-drag@3', 'd3-zoom@3',
+)
+
+# Choropleth colours: shares below MIN_PCT are grey, the rest run along a
+# log scale from the light to the dark stop through the middle one
+MIN_PCT = 0.01
+NO_DATA_COLOR = '#e5e5e5'
+COLOR_STOPS = ('#E8F4F8', '#2E86AB', '#1A535C')
+
+
+def simplify_ring(points, tolerance):
+    """Simplify a coordinate list with Douglas-Peucker, keeping both endpoints."""
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first][0], points[first][1]
+        dx, dy = points[last][0] - ax, points[last][1] - ay
+        segment_sq = dx * dx + dy * dy
+        max_sq, index = 0.0, first
+        for i in range(first + 1, last):
+            px, py = points[i][0] - ax, points[i][1] - ay
+            if segment_sq == 0:
+                # Closed ring: the first and last points coincide
+                dist_sq = px * px + py * py
+            else:
+                cross = dx * py - dy * px
+                dist_sq = cross * cross / segment_sq
+            if dist_sq > max_sq:
+                max_sq, index = dist_sq, i
+        if max_sq > tolerance_sq:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def to_json_bytes(obj):
+    """Serialize obj to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def to_json(obj):
+    """Serialize obj to compact JSON text for embedding in the page."""
+    return to_json_bytes(obj).decode('utf-8')
+
+
+def geometry_polygons(geometry):
+    """Return the polygons of a Polygon or MultiPolygon geometry as a list."""
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    return geometry['coordinates']
+
+
+def round_geometry(geometry):
+    """Round coordinates to whole metres in place, dropping repeated points.
+
+    The geometry is normalised to a MultiPolygon of point tuples. Rings that
+    collapse below a triangle are dropped, along with the holes of any polygon
+    whose exterior collapses.
+    """
+    polygons = []
+    for polygon in geometry_polygons(geometry):
+        rings = []
+        for ring in polygon:
+            rounded = []
+            for x, y in ring:
+                point = (round(x), round(y))
+                if not rounded or point != rounded[-1]:
+                    rounded.append(point)
+            if len(rounded) >= 4:
+                rings.append(rounded)
+            elif not rings:
+                break
+        if rings:
+            polygons.append(rings)
+    geometry['type'] = 'MultiPolygon'
+    geometry['coordinates'] = polygons
+
+
+def count_vertices(geometry):
+    """Count the coordinate pairs in a Polygon or MultiPolygon geometry."""
+    return sum(len(ring) for polygon in geometry_polygons(geometry) for ring in polygon)
+
+
+def geojson_bounds(geojson):
+    """Return (x_min, x_max, y_min, y_max) over every coordinate in the features."""
+    x_min = y_min = float('inf')
+    x_max = y_max = float('-inf')
+    stack = [feature['geometry']['coordinates'] for feature in geojson['features']]
+    while stack:
+        coords = stack.pop()
+        if isinstance(coords[0], (int, float)):
+            x, y = coords[0], coords[1]
+            x_min = min(x_min, x)
+            x_max = max(x_max, x)
+            y_min = min(y_min, y)
+            y_max = max(y_max, y)
+        else:
+            stack.extend(coords)
+    return x_min, x_max, y_min, y_max
+
+
+def build_topology(geojson, tolerance):
+    """Encode rounded constituency features as TopoJSON.
+
+    Rings are cut wherever three or more boundaries meet, so a border shared by
+    two constituencies is stored as one arc and referenced by both. Arcs are
+    simplified after cutting, which keeps neighbouring constituencies flush.
+    """
+    rings = [
+        ring[:-1]
+        for feature in geojson['features']
+        for polygon in feature['geometry']['coordinates']
+        for ring in polygon
+    ]
+    neighbours = defaultdict(set)
+    for ring in rings:
+        for i, point in enumerate(ring):
+            neighbours[point].update((ring[i - 1], ring[(i + 1) % len(ring)]))
+    junctions = {point for point, adjacent in neighbours.items() if len(adjacent) > 2}
+
+    arcs = []
+    arc_index = {}
+
+    def encode_ring(ring):
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if cuts:
+            # Start at a junction and split the ring at every junction
+            ring = ring[cuts[0]:] + ring[:cuts[0]] + [ring[cuts[0]]]
+            cuts = [i - cuts[0] for i in cuts] + [len(ring) - 1]
+            pieces = [ring[a:b + 1] for a, b in zip(cuts, cuts[1:])]
+        else:
+            # Unshared ring: rotate to a canonical start so enclaves match up
+            k = ring.index(min(ring))
+            pieces = [ring[k:] + ring[:k + 1]]
+
+        indices = []
+        for piece in pieces:
+            key = tuple(piece)
+            if key in arc_index:
+                indices.append(arc_index[key])
+            elif key[::-1] in arc_index:
+                indices.append(~arc_index[key[::-1]])
+            else:
+                arc_index[key] = len(arcs)
+                indices.append(len(arcs))
+                arcs.append(piece)
+        return indices
+
+    geometries = [
+        {
+            'type': 'MultiPolygon',
+            'arcs': [
+                [encode_ring(ring[:-1]) for ring in polygon]
+                for polygon in feature['geometry']['coordinates']
+            ],
+            'properties': {'SPC21NM': feature['properties']['SPC21NM']},
+        }
+        for feature in geojson['features']
+    ]
+
+    simplified = [simplify_ring(arc, tolerance) for arc in arcs]
+    for geometry in geometries:
+        for polygon in geometry['arcs']:
+            for ring in polygon:
+                ring_arcs = [i if i >= 0 else ~i for i in ring]
+                if sum(len(simplified[i]) - 1 for i in ring_arcs) < 3:
+                    # Too small to survive simplification; keep it as drawn
+                    for i in ring_arcs:
+                        simplified[i] = arcs[i]
+
+    # Delta-encode arcs against the bounding box origin, per the TopoJSON spec
+    x_min, x_max, y_min, y_max = geojson_bounds(geojson)
+    encoded = []
+    for arc in simplified:
+        previous_x, previous_y = x_min, y_min
+        deltas = []
+        for x, y in arc:
+            deltas.append([x - previous_x, y - previous_y])
+            previous_x, previous_y = x, y
+        encoded.append(deltas)
+
+    return {
+        'type': 'Topology',
+        'bbox': [x_min, y_min, x_max, y_max],
+        'transform': {'scale': [1, 1], 'translate': [x_min, y_min]},
+        'objects': {
+            'constituencies': {'type': 'GeometryCollection', 'geometries': geometries},
+        },
+        'arcs': encoded,
+    }
+
 
 def load_geo_json():
-    """Load constituency geographic boundaries."""
+    """Load constituency boundaries as a simplified TopoJSON topology."""
     print("Loading geographic boundaries...")
-    with open('data/scottish_parliament_constituencies.geojson') as f:
-        return json.load(f)
+    with open(GEOJSON_FILE, 'rb') as f:
+        data = f.read()
+    geojson = orjson.loads(data) if orjson is not None else json.loads(data)
+
+    before = 0
+    for feature in geojson['features']:
+        geometry = feature['geometry']
+        before += count_vertices(geometry)
+        # Sub-metre precision is far below a pixel after scaling, and whole
+        # metres make shared boundary vertices match exactly
+        round_geometry(geometry)
+
+    topology = build_topology(geojson, SIMPLIFY_TOLERANCE)
+    after = sum(len(arc) for arc in topology['arcs'])
+    print(f"Simplified boundaries from {before:,} vertices to "
+          f"{len(topology['arcs']):,} arcs with {after:,} vertices")
+    return topology
+
+
+def format_point(x, y):
+    """Format a screen point for SVG path data at 0.1px precision."""
+    return f"{round(x, 1):g},{round(y, 1):g}"
+
+
+def project_topology(topology):
+    """Project the topology into SVG path data for the map viewBox.
+
+    Mirrors the affine fit of British National Grid into the viewBox that the
+    page used to do with d3.geoTransform. Returns a list of
+    {'name', 'd', 'bounds'} dicts, one per constituency with bounds in screen
+    coordinates, and a single path tracing the borders shared between
+    constituencies.
+    """
+    x_min, y_min, x_max, y_max = topology['bbox']
+    data_width = x_max - x_min
+    data_height = y_max - y_min
+    geo_scale = min(
+        (MAP_WIDTH - 2 * MAP_PADDING) / data_width,
+        (MAP_HEIGHT - 2 * MAP_PADDING) / data_height,
+    ) * 0.92
+    offset_x = (MAP_WIDTH - data_width * geo_scale) / 2
+    offset_y = MAP_PADDING
+
+    scale_x, scale_y = topology['transform']['scale']
+    translate_x, translate_y = topology['transform']['translate']
+    arcs = []
+    for arc in topology['arcs']:
+        qx = qy = 0
+        points = []
+        for dx, dy in arc:
+            qx += dx
+            qy += dy
+            x = qx * scale_x + translate_x
+            y = qy * scale_y + translate_y
+            points.append((
+                (x - x_min) * geo_scale + offset_x,
+                MAP_HEIGHT - ((y - y_min) * geo_scale + offset_y),
+            ))
+        arcs.append(points)
+
+    def ring_points(ring):
+        points = []
+        for i in ring:
+            arc = arcs[i] if i >= 0 else arcs[~i][::-1]
+            points.extend(arc if not points else arc[1:])
+        return points
+
+    def path_data(points, close):
+        parts = []
+        for point in points:
+            part = format_point(*point)
+            if not parts or part != parts[-1]:
+                parts.append(part)
+        if close:
+            # Z returns to the first point, so the repeated closing point is redundant
+            if len(parts) > 1 and parts[-1] == parts[0]:
+                parts.pop()
+            if len(parts) < 3:
+                return ''
+            return 'M' + 'L'.join(parts) + 'Z'
+        if len(parts) < 2:
+            return ''
+        return 'M' + 'L'.join(parts)
+
+    geometries = topology['objects']['constituencies']['geometries']
+    arc_owners = defaultdict(set)
+    features = []
+    for index, geometry in enumerate(geometries):
+        rings = [ring for polygon in geometry['arcs'] for ring in polygon]
+        for ring in rings:
+            for i in ring:
+                arc_owners[i if i >= 0 else ~i].add(index)
+        ring_point_lists = [ring_points(ring) for ring in rings]
+        xs = [x for points in ring_point_lists for x, _ in points]
+        ys = [y for points in ring_point_lists for _, y in points]
+        features.append({
+            'name': geometry['properties']['SPC21NM'],
+            'd': ''.join(path_data(points, close=True) for points in ring_point_lists),
+            'bounds': [
+                [round(min(xs), 1), round(min(ys), 1)],
+                [round(max(xs), 1), round(max(ys), 1)],
+            ],
+        })
+
+    borders = ''.join(
+        path_data(arcs[i], close=False)
+        for i, owners in sorted(arc_owners.items())
+        if len(owners) > 1
+    )
+    return features, borders
+
+
+def interpolate_hex(start, end, t):
+    """Interpolate between two hex colours in RGB, as d3.interpolate does."""
+    channels = []
+    for i in (1, 3, 5):
+        a, b = int(start[i:i + 2], 16), int(end[i:i + 2], 16)
+        channels.append(math.floor(a + (b - a) * t + 0.5))
+    return '#' + ''.join(f'{c:02x}' for c in channels)
+
+
+def pct_color(pct, max_pct):
+    """Fill colour for a revenue share on the map's log colour scale."""
+    if pct < MIN_PCT:
+        return NO_DATA_COLOR
+    t = math.log(pct / MIN_PCT) / math.log(max_pct / MIN_PCT)
+    t = min(max(t, 0.0), 1.0)
+    if t < 0.5:
+        return interpolate_hex(COLOR_STOPS[0], COLOR_STOPS[1], t * 2)
+    return interpolate_hex(COLOR_STOPS[1], COLOR_STOPS[2], (t - 0.5) * 2)
 
 
 def load_impact_data():
     """Load mansion tax impact data."""
     print("Loading mansion tax impact data...")
-    impact_file = 'scottish_parliament_constituency_impact.csv'
-
-    if not Path(impact_file).exists():
-        print(f"ERROR: {impact_file} not found")
+    if not Path(IMPACT_FILE).exists():
+        print(f"ERROR: {IMPACT_FILE} not found")
         print("Run: python analyze_scottish_parliament_constituencies.py")
         return None
 
-    df = pd.read_csv(impact_file)
+    df = pd.read_csv(IMPACT_FILE)
     print(f"Loaded data for {len(df)} constituencies")
     return df
 
 
-def generate_d3_map_html(geojson, impact_data):
-    """Generate D3 HTML map with geographic view."""
+def build_map_data(topology, impact_data):
+    """Build the data file the map page fetches: boundaries plus impact figures."""
 
-    # Prepare impact data as JavaScript object - key by constituency name
-    impact_js = {}
-    for _, row in impact_data.iterrows():
-        impact_js[row['constituency']] = {
-            'pct': row['share_pct'],
-            'num': row['estimated_sales'],
-            'rev': row['allocated_revenue'],
-            'council': row['council']
-        }
+    # Impact figures keyed by constituency name
+    impact_js = (
+        impact_data
+        .rename(columns={'share_pct': 'pct', 'estimated_sales': 'num', 'allocated_revenue': 'rev'})
+        .set_index('constituency')[['pct', 'num', 'rev', 'council']]
+        .to_dict('index')
+    )
+
+    # Impact figures as parallel columns indexed by sorted constituency name,
+    # which also serves as the search list
+    names = sorted(impact_js)
+    columns = {
+        key: [impact_js[name][key] for name in names]
+        for key in ('pct', 'num', 'rev', 'council')
+    }
+
+    # Project boundaries to SVG path data here so the page does no geo work,
+    # and colour each constituency up front
+    features, borders = project_topology(topology)
+    max_pct = max(columns['pct'])
+    for feature in features:
+        data = impact_js.get(feature['name'])
+        feature['fill'] = pct_color(data['pct'], max_pct) if data else NO_DATA_COLOR
 
-    # Get all constituency names for search
-    all_constituencies = sorted(impact_data['constituency'].tolist())
+    return {
+        'features': features,
+        # Borders between constituencies, each shared arc drawn once
+        'borders': borders,
+        'names': names,
+        'pct': columns['pct'],
+        'num': columns['num'],
+        'rev': columns['rev'],
+        'councils': columns['council'],
+    }
+
+
+def generate_d3_map_html(map_data):
+    """Generate D3 HTML map with geographic view."""
+    max_pct = max(map_data['pct'])
+    d3_scripts = '\n'.join(
+        f'    <script src="https://cdn.jsdelivr.net/npm/{module}"></script>'
+        for module in D3_MODULES
+    )
 
     html_template = '''<!DOCTYPE html>
 <html lang="en">
@@ -56,8 +437,10 @@ def generate_d3_map_html(geojson, impact_data):
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Scottish Mansion Tax by Parliament Constituency</title>
-    <script src="https://d3js.org/d3.v7.min.js"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;600;700&display=swap" rel="stylesheet">
+    <link rel="preload" href="''' + DATA_FILE + '''" as="fetch" crossorigin>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;600;700&display=swap" rel="stylesheet" media="print" onload="this.media='all'">
     <style>
         * {
             box-sizing: border-box;
@@ -147,7 +530,7 @@ def generate_d3_map_html(geojson, impact_data):
             cursor: pointer;
             font-family: 'Roboto', sans-serif;
         }
-        .search-result-item:last-child {
+        .search-result-item.last-match {
             border-bottom: none;
         }
         .search-result-item:hover {
@@ -197,10 +580,17 @@ def generate_d3_map_html(geojson, impact_data):
         }
         .constituency-path {
             cursor: pointer;
-            transition: opacity 0.1s ease;
         }
-        .constituency-path:hover {
-            opacity: 0.8;
+        /* Stroke-only highlight, so hovering never repaints the fill */
+        .constituency-path:hover,
+        .constituency-path.selected {
+            stroke: #2E86AB;
+            stroke-width: calc(2px / var(--zoom-k, 1));
+        }
+        /* --zoom-k is updated when a zoom gesture ends, keeping strokes a
+           constant width on screen */
+        .constituency-borders {
+            stroke-width: calc(0.5px / var(--zoom-k, 1));
         }
         .map-controls {
             position: absolute;
@@ -304,7 +694,7 @@ def generate_d3_map_html(geojson, impact_data):
                 <div class="legend-gradient"></div>
                 <div class="legend-labels">
                     <span>0%</span>
-                    <span id="max-pct-label">12%</span>
+                    <span id="max-pct-label">''' + f"{max_pct:.1f}%" + '''</span>
                 </div>
             </div>
         </div>
@@ -325,61 +715,27 @@ def generate_d3_map_html(geojson, impact_data):
         </div>
     </div>
 
+''' + d3_scripts + '''
     <script>
-        const impactData = ''' + json.dumps(impact_js) + ''';
-
-        const geoData = ''' + json.dumps(geojson) + ''';
-
-        const allConstituencies = ''' + json.dumps(all_constituencies) + ''';
-
-        const width = 600;
-        const height = 900;
+        const width = ''' + str(MAP_WIDTH) + ''';
+        const height = ''' + str(MAP_HEIGHT) + ''';
 
         const svg = d3.select('#map');
         const g = svg.append('g');
         const tooltip = document.getElementById('tooltip');
 
-        // Calculate bounds of British National Grid coordinates
-        let xMin = Infinity, xMax = -Infinity, yMin = Infinity, yMax = -Infinity;
-        geoData.features.forEach(feature => {
-            const traverse = (coords) => {
-                if (typeof coords[0] === 'number') {
-                    xMin = Math.min(xMin, coords[0]);
-                    xMax = Math.max(xMax, coords[0]);
-                    yMin = Math.min(yMin, coords[1]);
-                    yMax = Math.max(yMax, coords[1]);
-                } else {
-                    coords.forEach(traverse);
-                }
-            };
-            traverse(feature.geometry.coordinates);
-        });
-
-        // Create scale to fit British National Grid into SVG
-        const padding = 20;
-        const dataWidth = xMax - xMin;
-        const dataHeight = yMax - yMin;
-        const geoScale = Math.min((width - 2 * padding) / dataWidth, (height - 2 * padding) / dataHeight) * 0.92;
-        const geoOffsetX = (width - dataWidth * geoScale) / 2;
-        const geoOffsetY = padding;
-
-        const projection = d3.geoTransform({
-            point: function(x, y) {
-                this.stream.point(
-                    (x - xMin) * geoScale + geoOffsetX,
-                    height - ((y - yMin) * geoScale + geoOffsetY)
-                );
-            }
-        });
-
-        const pathGenerator = d3.geoPath().projection(projection);
-
         // Zoom behavior
         const zoom = d3.zoom()
             .scaleExtent([1, 8])
             .on('zoom', (event) => {
+                // Only the parent transform changes during the gesture
                 g.attr('transform', event.transform);
-            });
+            })
+            .on('end', (event) => rerenderAtScale(event.transform.k));
+
+        function rerenderAtScale(k) {
+            g.node().style.setProperty('--zoom-k', k);
+        }
 
         svg.call(zoom);
 
@@ -394,140 +750,229 @@ def generate_d3_map_html(geojson, impact_data):
             svg.transition().call(zoom.transform, d3.zoomIdentity);
         });
 
-        // Color scale
-        const maxPct = Math.max(...Object.values(impactData).map(d => d.pct));
-        document.getElementById('max-pct-label').textContent = maxPct.toFixed(1) + '%';
-
-        // Use log scale for better variation
-        const minPct = 0.01;
-        const logScale = d3.scaleLog()
-            .domain([minPct, maxPct])
-            .range([0, 1])
-            .clamp(true);
-
-        const colorScale = (pct) => {
-            if (pct === 0 || pct < 0.01) return '#e5e5e5';
-            const t = logScale(Math.max(pct, minPct));
-            if (t < 0.5) {
-                return d3.interpolate('#E8F4F8', '#2E86AB')(t * 2);
-            } else {
-                return d3.interpolate('#2E86AB', '#1A535C')((t - 0.5) * 2);
-            }
-        };
-
-        // Draw geographic view
-        const geoPaths = g.selectAll('path')
-            .data(geoData.features)
-            .join('path')
-            .attr('class', 'constituency-path')
-            .attr('d', pathGenerator)
-            .attr('fill', d => {
-                const name = d.properties.SPC21NM;
-                const data = impactData[name];
-                return data ? colorScale(data.pct) : '#e5e5e5';
-            })
-            .attr('stroke', 'white')
-            .attr('stroke-width', 0.5)
-            .attr('opacity', 0.9)
-            .on('mouseenter', function(event, d) {
-                const name = d.properties.SPC21NM;
-                const data = impactData[name] || { pct: 0, num: 0, rev: 0, council: 'Unknown' };
-                showTooltip(name, data, event);
-                d3.select(this).attr('opacity', 1).attr('stroke-width', 2);
-            })
-            .on('mousemove', function(event, d) {
-                const name = d.properties.SPC21NM;
-                const data = impactData[name] || { pct: 0, num: 0, rev: 0, council: 'Unknown' };
-                showTooltip(name, data, event);
-            })
-            .on('mouseleave', function(event, d) {
-                d3.select(this).attr('opacity', 0.9).attr('stroke-width', 0.5);
+        // The map data lives in a separate JSON file so the page chrome can
+        // render while it downloads
+        fetch(''' + to_json(DATA_FILE) + ''')
+            .then(response => response.json())
+            .then(init)
+            .catch(error => console.error('Failed to load map data', error));
+
+        function init(data) {
+            const { features, borders, names, councils } = data;
+            const featureByName = Object.fromEntries(features.map(f => [f.name, f]));
+            const pct = new Float64Array(data.pct);
+            const num = new Float64Array(data.num);
+            const rev = new Float64Array(data.rev);
+            const idx = new Map(names.map((n, i) => [n, i]));
+
+            // Draw geographic view: build every path off-DOM and insert them in one go
+            const svgNS = 'http://www.w3.org/2000/svg';
+            const frag = document.createDocumentFragment();
+            const pathByName = new Map();
+            features.forEach(f => {
+                const p = document.createElementNS(svgNS, 'path');
+                p.setAttribute('class', 'constituency-path');
+                p.setAttribute('d', f.d);
+                p.setAttribute('fill', f.fill);
+                p.setAttribute('stroke', 'white');
+                p.setAttribute('stroke-width', 0);
+                p.setAttribute('opacity', 0.9);
+                p.dataset.name = f.name;
+                pathByName.set(f.name, p);
+                frag.appendChild(p);
+            });
+
+            const bordersPath = document.createElementNS(svgNS, 'path');
+            bordersPath.setAttribute('class', 'constituency-borders');
+            bordersPath.setAttribute('d', borders);
+            bordersPath.setAttribute('fill', 'none');
+            bordersPath.setAttribute('stroke', 'white');
+            bordersPath.setAttribute('pointer-events', 'none');
+            frag.appendChild(bordersPath);
+
+            g.node().appendChild(frag);
+            let selectedPath = null;
+
+            // Hover handlers delegated from the group rather than one per path
+            g.node().addEventListener('mouseover', event => {
+                const p = event.target;
+                if (!p.classList.contains('constituency-path')) return;
+                showTooltip(p.dataset.name, event);
+            });
+            g.node().addEventListener('mouseout', event => {
+                if (!event.target.classList.contains('constituency-path')) return;
                 hideTooltip();
             });
 
-        function showTooltip(name, data, event) {
-            tooltip.innerHTML = `
-                <h4>${name}</h4>
-                <div class="tooltip-council">${data.council}</div>
-                <div class="tooltip-value">£${(data.rev / 1000000).toFixed(2)}m</div>
-                <div class="tooltip-row">
-                    <span>Share of total</span>
-                    <span>${data.pct.toFixed(2)}%</span>
-                </div>
-            `;
-            tooltip.style.display = 'block';
+            function tooltipHtml(name) {
+                const i = idx.get(name);
+                const council = i === undefined ? 'Unknown' : councils[i];
+                const share = i === undefined ? 0 : pct[i];
+                const revenue = i === undefined ? 0 : rev[i];
+                return `
+                    <h4>${name}</h4>
+                    <div class="tooltip-council">${council}</div>
+                    <div class="tooltip-value">£${(revenue / 1000000).toFixed(2)}m</div>
+                    <div class="tooltip-row">
+                        <span>Share of total</span>
+                        <span>${share.toFixed(2)}%</span>
+                    </div>
+                `;
+            }
 
-            const rect = document.querySelector('.map-canvas').getBoundingClientRect();
-            const x = event.clientX - rect.left;
-            const y = event.clientY - rect.top;
-            tooltip.style.left = x + 'px';
-            tooltip.style.top = y + 'px';
-        }
+            // Tooltip content is built once per hovered constituency; a single
+            // pointermove on the svg only repositions it
+            const mapCanvas = document.querySelector('.map-canvas');
+            let canvasRect = mapCanvas.getBoundingClientRect();
+            const updateCanvasRect = () => {
+                canvasRect = mapCanvas.getBoundingClientRect();
+            };
+            window.addEventListener('resize', updateCanvasRect, { passive: true });
+            window.addEventListener('scroll', updateCanvasRect, { passive: true });
+            // Also re-read when the canvas itself changes size without a window resize
+            if (window.ResizeObserver) {
+                new ResizeObserver(updateCanvasRect).observe(mapCanvas);
+            }
 
-        function hideTooltip() {
-            tooltip.style.display = 'none';
-        }
+            let hovered = null;
 
-        // Search functionality
-        const searchInput = document.getElementById('search-input');
-        const searchResults = document.getElementById('search-results');
+            function showTooltip(name, event) {
+                hovered = name;
+                tooltip.innerHTML = tooltipHtml(name);
+                tooltip.style.display = 'block';
+                moveTooltip(event);
+            }
 
-        searchInput.addEventListener('input', function() {
-            const query = this.value.toLowerCase();
-            if (query.length < 2) {
-                searchResults.style.display = 'none';
-                return;
+            function moveTooltip(event) {
+                tooltip.style.left = (event.clientX - canvasRect.left) + 'px';
+                tooltip.style.top = (event.clientY - canvasRect.top) + 'px';
             }
 
-            const matches = allConstituencies.filter(name =>
-                name.toLowerCase().includes(query)
-            ).slice(0, 10);
+            svg.node().addEventListener('pointermove', event => {
+                if (hovered !== null) moveTooltip(event);
+            });
 
-            if (matches.length === 0) {
-                searchResults.style.display = 'none';
-                return;
+            function hideTooltip() {
+                hovered = null;
+                tooltip.style.display = 'none';
             }
 
-            searchResults.innerHTML = matches.map(name => {
-                const data = impactData[name] || { pct: 0, num: 0, rev: 0 };
-                return `
-                    <button class="search-result-item" data-name="${name}">
-                        <div class="result-name">${name}</div>
-                        <div class="result-value">£${(data.rev / 1000000).toFixed(2)}m | ${data.pct.toFixed(2)}%</div>
-                    </button>
-                `;
-            }).join('');
+            // Search functionality is not needed for first paint, so wire it up when idle
+            function initSearch() {
+                const searchInput = document.getElementById('search-input');
+                const searchResults = document.getElementById('search-results');
+
+                const loweredNames = names.map(name => name.toLowerCase());
+
+                // Bigram inverted index: each two-character substring maps to the
+                // ascending indices of the names containing it
+                const bigrams = new Map();
+                loweredNames.forEach((name, i) => {
+                    for (let k = 0; k < name.length - 1; k++) {
+                        const gram = name.slice(k, k + 2);
+                        let postings = bigrams.get(gram);
+                        if (!postings) {
+                            postings = [];
+                            bigrams.set(gram, postings);
+                        }
+                        if (postings[postings.length - 1] !== i) postings.push(i);
+                    }
+                });
+
+                // Indices of names containing every bigram of the query, in name order
+                function searchCandidates(query) {
+                    const lists = [];
+                    for (let k = 0; k < query.length - 1; k++) {
+                        const postings = bigrams.get(query.slice(k, k + 2));
+                        if (!postings) return [];
+                        lists.push(postings);
+                    }
+                    lists.sort((a, b) => a.length - b.length);
+                    let candidates = lists[0];
+                    for (const postings of lists.slice(1)) {
+                        const members = new Set(postings);
+                        candidates = candidates.filter(i => members.has(i));
+                    }
+                    return candidates;
+                }
+
+                // Pool of result buttons, created once and reused for every query
+                const resultItems = Array.from({ length: 10 }, () => {
+                    const item = document.createElement('button');
+                    item.className = 'search-result-item';
+                    item.style.display = 'none';
+                    const nameEl = document.createElement('div');
+                    nameEl.className = 'result-name';
+                    const valueEl = document.createElement('div');
+                    valueEl.className = 'result-value';
+                    item.append(nameEl, valueEl);
+                    searchResults.appendChild(item);
+                    return item;
+                });
+
+                // Coalesce fast typing into one filter pass
+                let searchTimer;
+                searchInput.addEventListener('input', function() {
+                    clearTimeout(searchTimer);
+                    searchTimer = setTimeout(runSearch, 80);
+                });
+
+                function runSearch() {
+                    const query = searchInput.value.toLowerCase();
+                    if (query.length < 2) {
+                        searchResults.style.display = 'none';
+                        return;
+                    }
+
+                    const matches = searchCandidates(query).filter(i =>
+                        loweredNames[i].includes(query)
+                    ).slice(0, resultItems.length);
+
+                    if (matches.length === 0) {
+                        searchResults.style.display = 'none';
+                        return;
+                    }
+
+                    resultItems.forEach((item, n) => {
+                        if (n >= matches.length) {
+                            item.style.display = 'none';
+                            return;
+                        }
+                        const i = matches[n];
+                        const name = names[i];
+                        item.dataset.name = name;
+                        item.firstChild.textContent = name;
+                        item.lastChild.textContent = `£${(rev[i] / 1000000).toFixed(2)}m | ${pct[i].toFixed(2)}%`;
+                        item.classList.toggle('last-match', n === matches.length - 1);
+                        item.style.display = '';
+                    });
 
-            searchResults.style.display = 'block';
+                    searchResults.style.display = 'block';
+                }
+
+                // One delegated listener for every result button
+                searchResults.addEventListener('click', function(e) {
+                    const item = e.target.closest('.search-result-item');
+                    if (!item) return;
 
-            searchResults.querySelectorAll('.search-result-item').forEach(item => {
-                item.addEventListener('click', function() {
-                    const name = this.dataset.name;
+                    const name = item.dataset.name;
                     searchInput.value = name;
                     searchResults.style.display = 'none';
 
-                    const data = impactData[name] || { pct: 0, num: 0, rev: 0, council: 'Unknown' };
-                    tooltip.innerHTML = `
-                        <h4>${name}</h4>
-                        <div class="tooltip-council">${data.council}</div>
-                        <div class="tooltip-value">£${(data.rev / 1000000).toFixed(2)}m</div>
-                        <div class="tooltip-row"><span>Share of total</span><span>${data.pct.toFixed(2)}%</span></div>
-                    `;
+                    tooltip.innerHTML = tooltipHtml(name);
                     tooltip.style.display = 'block';
                     tooltip.style.left = '50%';
                     tooltip.style.top = '50%';
 
-                    // Reset all opacity
-                    g.selectAll('.constituency-path').attr('opacity', 0.9).attr('stroke-width', 0.5);
                     // Highlight selected
-                    g.selectAll('.constituency-path')
-                        .filter(d => d.properties.SPC21NM === name)
-                        .attr('opacity', 1).attr('stroke-width', 2);
+                    if (selectedPath) selectedPath.classList.remove('selected');
+                    selectedPath = pathByName.get(name) || null;
+                    if (selectedPath) selectedPath.classList.add('selected');
 
                     // Zoom to constituency
-                    const feature = geoData.features.find(f => f.properties.SPC21NM === name);
+                    const feature = featureByName[name];
                     if (feature) {
-                        const bounds = pathGenerator.bounds(feature);
+                        const bounds = feature.bounds;
                         const dx = bounds[1][0] - bounds[0][0];
                         const dy = bounds[1][1] - bounds[0][1];
                         const x = (bounds[0][0] + bounds[1][0]) / 2;
@@ -539,14 +984,16 @@ def generate_d3_map_html(geojson, impact_data):
                         );
                     }
                 });
-            });
-        });
 
-        document.addEventListener('click', function(e) {
-            if (!searchInput.contains(e.target) && !searchResults.contains(e.target)) {
-                searchResults.style.display = 'none';
+                document.addEventListener('click', function(e) {
+                    if (!searchInput.contains(e.target) && !searchResults.contains(e.target)) {
+                        searchResults.style.display = 'none';
+                    }
+                });
             }
-        });
+
+            (window.requestIdleCallback || setTimeout)(initSearch);
+        }
     </script>
 </body>
 </html>'''
@@ -554,25 +1001,61 @@ def generate_d3_map_html(geojson, impact_data):
     return html_template
 
 
+def inputs_hash():
+    """Hash the boundaries, impact CSV and this script to detect a stale map."""
+    digest = hashlib.blake2b()
+    for path in (GEOJSON_FILE, IMPACT_FILE, __file__):
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def write_with_gzip(path, content):
+    """Write content bytes to path, plus a precompressed path.gz copy.
+
+    The .gz lets static hosts serve Content-Encoding: gzip directly; mtime=0
+    keeps it byte-identical across runs.
+    """
+    with open(path, 'wb') as f:
+        f.write(content)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    print(f"Saved {path} ({len(content) / 1024:,.0f} KB) and {path}.gz")
+
+
 def main():
     """Main execution."""
     print("=" * 70)
     print("Scottish Mansion Tax - D3 Map Visualization")
     print("=" * 70)
 
-    geojson = load_geo_json()
+    output_file = OUTPUT_FILE
+    outputs = [output_file, output_file + '.gz', DATA_FILE, DATA_FILE + '.gz']
+    hash_file = Path(output_file + '.hash')
+    digest = inputs_hash() if Path(IMPACT_FILE).exists() else None
+    if (
+        digest is not None
+        and all(Path(path).exists() for path in outputs)
+        and hash_file.exists()
+        and hash_file.read_text().strip() == digest
+    ):
+        print(f"{output_file} is up to date with its inputs, skipping (cached)")
+        return
+
+    topology = load_geo_json()
     impact_data = load_impact_data()
 
     if impact_data is None:
         return
 
     print("Generating D3 map...")
-    html_content = generate_d3_map_html(geojson, impact_data)
+    map_data = build_map_data(topology, impact_data)
+    html_content = generate_d3_map_html(map_data)
 
-    output_file = 'scottish_mansion_tax_map.html'
-    with open(output_file, 'w') as f:
-        f.write(html_content)
-    print(f"Saved {output_file}")
+    write_with_gzip(output_file, html_content.encode('utf-8'))
+    # Serialised straight to bytes: the data file is the only place the
+    # boundaries are re-encoded, and only after simplification and projection
+    write_with_gzip(DATA_FILE, to_json_bytes(map_data))
+    hash_file.write_text(digest + '\n')
 
     print("\n" + "=" * 70)
     print("Visualization complete!")
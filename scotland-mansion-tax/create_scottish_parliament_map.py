@@ -6,19 +6,64 @@ Generates:
 1. Bar chart of top constituencies by impact
 2. Interactive HTML report with all data
 3. Summary statistics
+
+Set EMIT_PNG=1 to also export the bar chart as a PNG. This needs kaleido
+and is off by default because kaleido starts a headless browser.
 """
 
+import functools
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.offline import get_plotlyjs_version
 from pathlib import Path
 
 # Revenue and policy constants
 SCOTTISH_GOV_REVENUE_ESTIMATE = 16_000_000  # £16 million
 
+# Same plotly.js build that write_html(include_plotlyjs='cdn') references
+PLOTLY_CDN_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+# pyarrow's multithreaded CSV parser when it is installed, else pandas' C parser
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# Single-pass HTML escaping for text columns interpolated into the report
+HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+# Columns used from the impact CSV, with explicit dtypes to skip inference
+IMPACT_DTYPES = {
+    'constituency': 'category',
+    'council': 'category',
+    'estimated_sales': 'float64',
+    'band_i_sales': 'float64',
+    'band_j_sales': 'float64',
+    'share_pct': 'float64',
+    'allocated_revenue': 'float64',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _read_constituency_data(input_file, mtime_ns):
+    """Parse the impact CSV and add derived columns; cached per file version."""
+    df = pd.read_csv(
+        input_file, usecols=list(IMPACT_DTYPES), dtype=IMPACT_DTYPES, engine=CSV_ENGINE
+    )
+    df['revenue_m'] = df['allocated_revenue'] / 1e6
+    for col in ('constituency', 'council'):
+        df[f'{col}_html'] = df[col].astype(str).str.translate(HTML_ESCAPES)
+    return df
+
 
 def load_constituency_data():
-    """Load the constituency impact data."""
+    """Load the constituency impact data.
+
+    Repeat calls (e.g. re-running main in a notebook) reuse the parsed CSV
+    until the file changes.
+    """
     print("Loading constituency impact data...")
 
     input_file = "scottish_parliament_constituency_impact.csv"
@@ -27,7 +72,7 @@ def load_constituency_data():
         print("Run: python analyze_scottish_parliament_constituencies.py")
         return None
 
-    df = pd.read_csv(input_file)
+    df = _read_constituency_data(input_file, Path(input_file).stat().st_mtime_ns).copy()
     print(f"Loaded {len(df)} constituencies")
     return df
 
@@ -37,27 +82,25 @@ def create_bar_chart(df, top_n=25):
     print(f"Creating bar chart for top {top_n} constituencies...")
 
     # Get top constituencies by impact
-    top_df = df.head(top_n).copy()
-    top_df = top_df.sort_values('allocated_revenue', ascending=True)  # For horizontal bar chart
+    top_df = df.head(top_n).sort_values('allocated_revenue', ascending=True)  # For horizontal bar chart
 
     # Create figure
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
         y=top_df['constituency'],
-        x=top_df['allocated_revenue'] / 1e6,  # Convert to millions
+        x=top_df['revenue_m'],
         orientation='h',
         marker_color='#2E86AB',
-        text=[f"£{v/1e6:.2f}m" for v in top_df['allocated_revenue']],
+        text=top_df['revenue_m'].map('£{:.2f}m'.format).tolist(),
         textposition='outside',
-        hovertemplate=(
-            "<b>%{y}</b><br>"
-            "Council: %{customdata[0]}<br>"
-            "Est. sales: %{customdata[1]:.1f}<br>"
-            "Revenue: £%{x:.2f}m<br>"
-            "<extra></extra>"
-        ),
-        customdata=top_df[['council', 'estimated_sales']].values
+        hovertext=[
+            f"<b>{name}</b><br>Council: {council}<br>Est. sales: {sales:.1f}<br>Revenue: £{rev:.2f}m<br>"
+            for name, council, sales, rev in zip(
+                top_df['constituency'], top_df['council'], top_df['estimated_sales'], top_df['revenue_m']
+            )
+        ],
+        hoverinfo='text'
     ))
 
     fig.update_layout(
@@ -89,16 +132,13 @@ def create_bar_chart(df, top_n=25):
     return fig
 
 
-def create_council_breakdown_chart(df):
-    """Create pie/bar chart showing council-level breakdown."""
+def create_council_breakdown_chart(council_df):
+    """Create pie/bar chart showing council-level breakdown.
+
+    council_df holds one row per council with summed sales, revenue and share.
+    """
     print("Creating council breakdown chart...")
 
-    # Aggregate by council
-    council_df = df.groupby('council').agg({
-        'estimated_sales': 'sum',
-        'allocated_revenue': 'sum',
-        'share_pct': 'sum'
-    }).reset_index()
     council_df = council_df.sort_values('allocated_revenue', ascending=False)
 
     # Top councils + "Other"
@@ -139,30 +179,29 @@ def create_council_breakdown_chart(df):
     return fig
 
 
-def create_edinburgh_breakdown(df):
+def create_edinburgh_breakdown(edinburgh_df):
     """Create detailed Edinburgh constituency breakdown."""
     print("Creating Edinburgh constituency breakdown...")
 
-    edinburgh_df = df[df['council'] == 'City of Edinburgh'].copy()
     edinburgh_df = edinburgh_df.sort_values('allocated_revenue', ascending=True)
 
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
         y=edinburgh_df['constituency'],
-        x=edinburgh_df['allocated_revenue'] / 1e6,
+        x=edinburgh_df['revenue_m'],
         orientation='h',
         marker_color=['#1A535C', '#4ECDC4', '#FF6B6B', '#FFE66D', '#95E1D3', '#F38181'],
-        text=[f"£{v/1e6:.2f}m ({s:.0f} sales)"
-              for v, s in zip(edinburgh_df['allocated_revenue'], edinburgh_df['estimated_sales'])],
+        text=[f"£{v:.2f}m ({s:.0f} sales)"
+              for v, s in zip(edinburgh_df['revenue_m'], edinburgh_df['estimated_sales'])],
         textposition='outside',
-        hovertemplate=(
-            "<b>%{y}</b><br>"
-            "Est. sales: %{customdata:.1f}<br>"
-            "Revenue: £%{x:.2f}m<br>"
-            "<extra></extra>"
-        ),
-        customdata=edinburgh_df['estimated_sales']
+        hovertext=[
+            f"<b>{name}</b><br>Est. sales: {sales:.1f}<br>Revenue: £{rev:.2f}m<br>"
+            for name, sales, rev in zip(
+                edinburgh_df['constituency'], edinburgh_df['estimated_sales'], edinburgh_df['revenue_m']
+            )
+        ],
+        hoverinfo='text'
     ))
 
     total_revenue = edinburgh_df['allocated_revenue'].sum()
@@ -190,20 +229,23 @@ def create_edinburgh_breakdown(df):
     return fig
 
 
-def create_html_report(df):
-    """Create comprehensive HTML report."""
-    print("Creating HTML report...")
+EDINBURGH_AREAS = {
+    'Edinburgh Central': 'New Town (EH3), West End',
+    'Edinburgh Western': 'Barnton, Cramond (EH4)',
+    'Edinburgh Southern': 'Morningside, Grange, Merchiston',
+    'Edinburgh Pentlands': 'Corstorphine, Juniper Green',
+    'Edinburgh Northern and Leith': 'Trinity, Leith, Inverleith',
+    'Edinburgh Eastern': 'Portobello, Duddingston'
+}
+EDINBURGH_AREAS_HTML = {name: areas.translate(HTML_ESCAPES) for name, areas in EDINBURGH_AREAS.items()}
 
-    # Calculate summary stats
-    total_revenue = df['allocated_revenue'].sum()
-    total_sales = df['estimated_sales'].sum()
-    constituencies_with_impact = len(df[df['estimated_sales'] > 0])
+def embed_figure(fig, div_id):
+    """Render a figure as a bare div for embedding in a page that loads plotly.js."""
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
 
-    edinburgh_df = df[df['council'] == 'City of Edinburgh']
-    edinburgh_revenue = edinburgh_df['allocated_revenue'].sum()
-    edinburgh_share = edinburgh_revenue / total_revenue * 100
 
-    html = f"""<!DOCTYPE html>
+# Page skeleton for create_html_report, filled with str.format_map
+REPORT_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
     <title>Scottish Mansion Tax - Parliament Constituency Analysis</title>
@@ -285,6 +327,9 @@ def create_html_report(df):
         .highlight {{
             background: #e3f2fd;
         }}
+        .edinburgh-data td:first-child {{
+            font-weight: bold;
+        }}
         .policy-box {{
             background: #f8f9fa;
             border-left: 4px solid #4ECDC4;
@@ -298,6 +343,7 @@ def create_html_report(df):
             font-size: 14px;
         }}
     </style>
+    <script src="{plotly_cdn}"></script>
 </head>
 <body>
     <div class="header">
@@ -307,7 +353,7 @@ def create_html_report(df):
 
     <div class="stats-grid">
         <div class="stat-card">
-            <div class="stat-value">£{total_revenue/1e6:.1f}m</div>
+            <div class="stat-value">£{total_revenue_m:.1f}m</div>
             <div class="stat-label">Total Estimated Revenue</div>
         </div>
         <div class="stat-card">
@@ -338,6 +384,16 @@ def create_html_report(df):
         </div>
     </div>
 
+    <div class="section">
+        <h2>Revenue by Constituency</h2>
+        {bar_chart}
+    </div>
+
+    <div class="section">
+        <h2>Revenue by Council Area</h2>
+        {council_chart}
+    </div>
+
     <div class="section">
         <h2>Top 20 Constituencies by Impact</h2>
         <table>
@@ -351,87 +407,20 @@ def create_html_report(df):
                 <th>Revenue</th>
                 <th>Share</th>
             </tr>
-"""
-
-    for i, row in df.head(20).iterrows():
-        rank = df.index.get_loc(i) + 1
-        highlight = ' class="highlight"' if row['council'] == 'City of Edinburgh' else ''
-        html += f"""            <tr{highlight}>
-                <td>{rank}</td>
-                <td><strong>{row['constituency']}</strong></td>
-                <td>{row['council']}</td>
-                <td>{row['estimated_sales']:.1f}</td>
-                <td>{row['band_i_sales']:.1f}</td>
-                <td>{row['band_j_sales']:.1f}</td>
-                <td>£{row['allocated_revenue']/1e6:.2f}m</td>
-                <td>{row['share_pct']:.1f}%</td>
-            </tr>
-"""
-
-    html += """        </table>
+{top_rows}        </table>
     </div>
 
     <div class="section">
         <h2>Edinburgh Breakdown</h2>
         <p>Edinburgh constituencies account for over half of the total impact:</p>
-        <table>
-            <tr>
-                <th>Constituency</th>
-                <th>Key Areas</th>
-                <th>Est. Sales</th>
-                <th>Revenue</th>
-                <th>Share of Edinburgh</th>
-            </tr>
-"""
-
-    edinburgh_total = edinburgh_df['allocated_revenue'].sum()
-    edinburgh_areas = {
-        'Edinburgh Central': 'New Town (EH3), West End',
-        'Edinburgh Western': 'Barnton, Cramond (EH4)',
-        'Edinburgh Southern': 'Morningside, Grange, Merchiston',
-        'Edinburgh Pentlands': 'Corstorphine, Juniper Green',
-        'Edinburgh Northern and Leith': 'Trinity, Leith, Inverleith',
-        'Edinburgh Eastern': 'Portobello, Duddingston'
-    }
-
-    for _, row in edinburgh_df.sort_values('estimated_sales', ascending=False).iterrows():
-        area_desc = edinburgh_areas.get(row['constituency'], '')
-        share_of_edin = row['allocated_revenue'] / edinburgh_total * 100
-        html += f"""            <tr>
-                <td><strong>{row['constituency']}</strong></td>
-                <td>{area_desc}</td>
-                <td>{row['estimated_sales']:.0f}</td>
-                <td>£{row['allocated_revenue']/1e6:.2f}m</td>
-                <td>{share_of_edin:.0f}%</td>
-            </tr>
-"""
-
-    html += f"""        </table>
-        <p><strong>Edinburgh Total:</strong> {edinburgh_df['estimated_sales'].sum():.0f} sales, £{edinburgh_total/1e6:.2f}m ({edinburgh_share:.1f}% of Scotland)</p>
+        {edinburgh_chart}
+        {edinburgh_table}
+        <p><strong>Edinburgh Total:</strong> {edinburgh_sales:.0f} sales, £{edinburgh_revenue_m:.2f}m ({edinburgh_share:.1f}% of Scotland)</p>
     </div>
 
     <div class="section">
         <h2>Full Constituency Data</h2>
-        <table>
-            <tr>
-                <th>Constituency</th>
-                <th>Council</th>
-                <th>Est. Sales</th>
-                <th>Revenue</th>
-            </tr>
-"""
-
-    for _, row in df.iterrows():
-        if row['estimated_sales'] > 0:
-            html += f"""            <tr>
-                <td>{row['constituency']}</td>
-                <td>{row['council']}</td>
-                <td>{row['estimated_sales']:.1f}</td>
-                <td>£{row['allocated_revenue']/1e6:.2f}m</td>
-            </tr>
-"""
-
-    html += """        </table>
+        {full_table}
     </div>
 
     <div class="section">
@@ -454,7 +443,77 @@ def create_html_report(df):
 </body>
 </html>"""
 
-    return html
+
+def create_html_report(df, edinburgh_df, total_revenue, bar_fig, council_fig, edin_fig):
+    """Create comprehensive HTML report with the charts embedded.
+
+    The page loads plotly.js once from the CDN; each chart is written as a
+    bare div without its own copy of the library.
+    """
+    print("Creating HTML report...")
+
+    edinburgh_revenue = edinburgh_df['allocated_revenue'].sum()
+
+    # Format every displayed column once; the three tables are slices of this
+    cells = pd.DataFrame({
+        'Constituency': df['constituency_html'],
+        'Council': df['council_html'],
+        'Est. Sales': df['estimated_sales'].map('{:.1f}'.format),
+        'Band I': df['band_i_sales'].map('{:.1f}'.format),
+        'Band J': df['band_j_sales'].map('{:.1f}'.format),
+        'Revenue': df['revenue_m'].map('£{:.2f}m'.format),
+        'Share': df['share_pct'].map('{:.1f}%'.format),
+        'highlight': df['council'].eq('City of Edinburgh').map({True: ' class="highlight"', False: ''}),
+    })
+
+    # Top 20 rows carry a per-row highlight class, which to_html can't emit
+    top_cols = ['highlight', 'Constituency', 'Council', 'Est. Sales', 'Band I', 'Band J', 'Revenue', 'Share']
+    top_rows = [
+        f"""            <tr{highlight}>
+                <td>{rank}</td>
+                <td><strong>{constituency}</strong></td>
+                <td>{council}</td>
+                <td>{sales}</td>
+                <td>{band_i}</td>
+                <td>{band_j}</td>
+                <td>{revenue}</td>
+                <td>{share}</td>
+            </tr>
+"""
+        for rank, (highlight, constituency, council, sales, band_i, band_j, revenue, share)
+        in enumerate(cells.head(20)[top_cols].itertuples(index=False, name=None), start=1)
+    ]
+
+    # Cell text is already escaped, so to_html must not escape it again
+    table_options = dict(index=False, escape=False, border=0, justify='left')
+
+    edin_sorted = edinburgh_df.sort_values('estimated_sales', ascending=False)
+    edinburgh_table = cells.loc[edin_sorted.index, ['Constituency']].assign(**{
+        'Key Areas': edin_sorted['constituency'].map(EDINBURGH_AREAS_HTML).fillna(''),
+        'Est. Sales': edin_sorted['estimated_sales'].map('{:.0f}'.format),
+        'Revenue': cells['Revenue'],
+        'Share of Edinburgh': (edin_sorted['allocated_revenue'] / edinburgh_revenue * 100).map('{:.0f}%'.format),
+    }).to_html(classes='edinburgh-data', **table_options)
+
+    full_table = cells.loc[
+        df['estimated_sales'] > 0, ['Constituency', 'Council', 'Est. Sales', 'Revenue']
+    ].to_html(classes='full-data', **table_options)
+
+    return REPORT_TEMPLATE.format_map({
+        'plotly_cdn': PLOTLY_CDN_URL,
+        'bar_chart': embed_figure(bar_fig, 'bar-chart'),
+        'council_chart': embed_figure(council_fig, 'council-chart'),
+        'edinburgh_chart': embed_figure(edin_fig, 'edinburgh-chart'),
+        'total_revenue_m': total_revenue / 1e6,
+        'total_sales': df['estimated_sales'].sum(),
+        'constituencies_with_impact': int(df['estimated_sales'].gt(0).sum()),
+        'edinburgh_share': edinburgh_revenue / total_revenue * 100,
+        'top_rows': "".join(top_rows),
+        'edinburgh_table': edinburgh_table,
+        'edinburgh_sales': edinburgh_df['estimated_sales'].sum(),
+        'edinburgh_revenue_m': edinburgh_revenue / 1e6,
+        'full_table': full_table,
+    })
 
 
 def main():
@@ -468,32 +527,43 @@ def main():
     if df is None:
         return
 
-    # Create bar chart
+    # Shared slices and aggregates, computed once for all outputs
+    edinburgh_df = df[df['council'].eq('City of Edinburgh')]
+    council_df = df.groupby('council', observed=True)[
+        ['estimated_sales', 'allocated_revenue', 'share_pct']
+    ].sum().reset_index()
+    total_revenue = df['allocated_revenue'].sum()
+
+    # Build every output first; figure construction stays on this thread
     bar_fig = create_bar_chart(df)
-    bar_fig.write_html("scottish_parliament_mansion_tax_bar.html")
-    print("Saved: scottish_parliament_mansion_tax_bar.html")
-
-    try:
-        bar_fig.write_image("scottish_parliament_mansion_tax_bar.png", width=1000, height=800)
-        print("Saved: scottish_parliament_mansion_tax_bar.png")
-    except Exception as e:
-        print(f"Could not save PNG (install kaleido): {e}")
-
-    # Create council breakdown
-    council_fig = create_council_breakdown_chart(df)
-    council_fig.write_html("scottish_mansion_tax_council_breakdown.html")
-    print("Saved: scottish_mansion_tax_council_breakdown.html")
-
-    # Create Edinburgh breakdown
-    edin_fig = create_edinburgh_breakdown(df)
-    edin_fig.write_html("scottish_mansion_tax_edinburgh.html")
-    print("Saved: scottish_mansion_tax_edinburgh.html")
-
-    # Create HTML report
-    html_report = create_html_report(df)
-    with open("scottish_parliament_constituency_report.html", "w") as f:
-        f.write(html_report)
-    print("Saved: scottish_parliament_constituency_report.html")
+
+    if os.environ.get("EMIT_PNG") == "1":
+        try:
+            bar_fig.write_image("scottish_parliament_mansion_tax_bar.png", width=1000, height=800)
+            print("Saved: scottish_parliament_mansion_tax_bar.png")
+        except Exception as e:
+            print(f"Could not save PNG (install kaleido): {e}")
+
+    council_fig = create_council_breakdown_chart(council_df)
+    edin_fig = create_edinburgh_breakdown(edinburgh_df)
+    html_report = create_html_report(df, edinburgh_df, total_revenue, bar_fig, council_fig, edin_fig)
+
+    # The files are independent, so serialise and write them concurrently
+    # Standalone chart pages pull plotly.js from the CDN rather than inlining ~4.6 MB each
+    writers = {
+        "scottish_parliament_mansion_tax_bar.html":
+            functools.partial(bar_fig.write_html, include_plotlyjs='cdn'),
+        "scottish_mansion_tax_council_breakdown.html":
+            functools.partial(council_fig.write_html, include_plotlyjs='cdn'),
+        "scottish_mansion_tax_edinburgh.html":
+            functools.partial(edin_fig.write_html, include_plotlyjs='cdn'),
+        "scottish_parliament_constituency_report.html": lambda path: Path(path).write_text(html_report),
+    }
+    with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+        futures = {path: executor.submit(write, path) for path, write in writers.items()}
+    for path, future in futures.items():
+        future.result()
+        print(f"Saved: {path}")
 
     print("\n" + "=" * 60)
     print("Visualization complete!")
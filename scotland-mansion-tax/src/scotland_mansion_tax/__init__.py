@@ -8,16 +8,27 @@ Analysis of Scotland's proposed council tax reform for £1m+ properties
 __version__ = "0.1.0"
 __author__ = "PolicyEngine"
 
-from scotland_mansion_tax.analysis import analyze_constituencies
-from scotland_mansion_tax.data import (
-    download_all,
-    load_population_data,
-    load_wealth_factors,
-)
-
-__all__ = [
-    "analyze_constituencies",
-    "download_all",
-    "load_population_data",
-    "load_wealth_factors",
-]
+import importlib
+
+# Lazy imports so importing a submodule does not load every other one (PEP 562)
+_LAZY_ATTRIBUTES = {
+    "analyze_constituencies": "scotland_mansion_tax.analysis",
+    "download_all": "scotland_mansion_tax.data",
+    "load_population_data": "scotland_mansion_tax.data",
+    "load_wealth_factors": "scotland_mansion_tax.data",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """Import analysis/data helpers on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
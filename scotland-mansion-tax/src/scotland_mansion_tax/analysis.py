@@ -11,6 +11,7 @@ Data source: National Records of Scotland Small Area Statistics 2024
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from scotland_mansion_tax.data import load_wealth_factors, get_data_dir
@@ -123,6 +124,137 @@ CONSTITUENCY_COUNCIL_MAPPING = {
     "Shetland Islands": "Shetland Islands",
 }
 
+# DataFrame form of the mapping, built once at import so councils are joined
+# onto constituencies with a merge rather than a per-row dict lookup
+_CONSTITUENCY_COUNCIL_DF = (
+    pd.Series(CONSTITUENCY_COUNCIL_MAPPING, name="council")
+    .rename_axis("constituency")
+    .reset_index()
+    .astype({"constituency": "category", "council": "category"})
+)
+
+
+# NRS workbook columns needed for the Band H aggregation, and their short names
+DWELLING_COLUMNS = {
+    "Data Zone code": "DataZone",
+    "Total number of dwellings": "TotalDwellings",
+    "Council Tax band: H": "BandH",
+}
+
+# Constituency-level Band H totals written by build_band_h_cache, and the raw
+# NRS files they are aggregated from
+BAND_H_CACHE_FILE = "band_h_by_constituency.csv"
+BAND_H_SOURCE_FILES = ("dwelling_estimates_by_dz.xlsx", "dz_to_constituency_lookup.csv")
+BAND_H_CACHE_DTYPES = {
+    "ConstituencyCode": "category",
+    "TotalDwellings": "int32",
+    "BandH": "int32",
+}
+
+
+def _normalise_header(name) -> str:
+    """Collapse the line breaks NRS puts in workbook headers."""
+    return str(name).replace("\n", " ").strip()
+
+
+def load_dwelling_estimates(dwelling_file: Path) -> pd.DataFrame:
+    """Load Data Zone dwelling totals and Band H counts from the NRS workbook.
+
+    Parsing the XLSX is slow, so the three columns we need are cached to a
+    pickle next to the workbook and reused until the workbook changes.
+
+    Args:
+        dwelling_file: Path to dwelling_estimates_by_dz.xlsx.
+
+    Returns:
+        DataFrame with DataZone, TotalDwellings, BandH.
+    """
+    cache_file = dwelling_file.with_suffix(".pkl")
+    if cache_file.exists() and cache_file.stat().st_mtime >= dwelling_file.stat().st_mtime:
+        return pd.read_pickle(cache_file)
+
+    df = pd.read_excel(
+        dwelling_file,
+        sheet_name="2023",
+        header=4,
+        usecols=lambda c: _normalise_header(c) in DWELLING_COLUMNS,
+    )
+    df.columns = df.columns.map(_normalise_header)
+
+    dz_data = df[list(DWELLING_COLUMNS)].rename(columns=DWELLING_COLUMNS)
+    dz_data = dz_data.dropna(subset=["DataZone"])
+    dz_data.to_pickle(cache_file)
+    return dz_data
+
+
+def _band_h_cache_is_current(data_dir: Path) -> bool:
+    """Whether the Band H cache exists and is no older than its NRS sources."""
+    cache_file = data_dir / BAND_H_CACHE_FILE
+    if not cache_file.exists():
+        return False
+    cache_mtime = cache_file.stat().st_mtime
+    return all(
+        cache_mtime >= source.stat().st_mtime
+        for source in (data_dir / name for name in BAND_H_SOURCE_FILES)
+        if source.exists()
+    )
+
+
+def aggregate_band_h_by_constituency(data_dir: Path) -> pd.DataFrame:
+    """Sum Data Zone dwelling and Band H counts up to constituency level.
+
+    Args:
+        data_dir: Directory containing the NRS workbook and DZ lookup.
+
+    Returns:
+        DataFrame with ConstituencyCode, TotalDwellings, BandH.
+    """
+    # Load dwelling estimates with Band H
+    dz_data = load_dwelling_estimates(data_dir / "dwelling_estimates_by_dz.xlsx")
+
+    # Load DZ to Constituency lookup
+    lookup = pd.read_csv(
+        data_dir / "dz_to_constituency_lookup.csv",
+        usecols=["DataZone", "ConstituencyCode"],
+        dtype={"DataZone": "string", "ConstituencyCode": "category"},
+    )
+
+    # Merge and aggregate
+    merged = dz_data.merge(lookup, on="DataZone", how="left")
+    return merged.groupby("ConstituencyCode", sort=False, observed=True).agg({
+        "TotalDwellings": "sum",
+        "BandH": "sum"
+    }).reset_index()
+
+
+def build_band_h_cache(data_dir: Optional[Path] = None, verbose: bool = True) -> Path:
+    """Write the constituency-level Band H totals used by generate_band_h_csv.
+
+    Run after downloading a new NRS release. The output is a local build
+    artifact in the data directory, not committed; it saves later runs the
+    workbook parse and Data Zone merge until the NRS files change again.
+
+    Args:
+        data_dir: Directory containing NRS data files. The cache is written here.
+        verbose: Print progress messages.
+
+    Returns:
+        Path to the written cache file.
+    """
+    if data_dir is None:
+        data_dir = get_data_dir()
+
+    constituency_data = aggregate_band_h_by_constituency(data_dir).astype(
+        BAND_H_CACHE_DTYPES
+    )
+    cache_file = data_dir / BAND_H_CACHE_FILE
+    constituency_data.to_csv(cache_file, index=False)
+
+    if verbose:
+        print(f"Saved Band H totals for {len(constituency_data)} constituencies to {cache_file}")
+
+    return cache_file
+
 
 def generate_band_h_csv(
     data_dir: Optional[Path] = None,
@@ -146,46 +278,37 @@ def generate_band_h_csv(
     if verbose:
         print("Loading Band H data from NRS...")
 
-    # Load dwelling estimates with Band H
-    dwelling_file = data_dir / "dwelling_estimates_by_dz.xlsx"
-    df = pd.read_excel(dwelling_file, sheet_name="2023", header=4)
-    df.columns = df.columns.str.replace("\n", " ").str.strip()
-
-    dz_data = df[["Data Zone code", "Total number of dwellings", "Council Tax band: H"]].copy()
-    dz_data.columns = ["DataZone", "TotalDwellings", "BandH"]
-    dz_data = dz_data.dropna(subset=["DataZone"])
-
-    # Load DZ to Constituency lookup
-    lookup = pd.read_csv(data_dir / "dz_to_constituency_lookup.csv")
-
-    # Merge and aggregate
-    merged = dz_data.merge(lookup, on="DataZone", how="left")
-    constituency_data = merged.groupby("ConstituencyCode").agg({
-        "TotalDwellings": "sum",
-        "BandH": "sum"
-    }).reset_index()
+    # Band H totals per constituency: the build-cache output unless the NRS
+    # files have changed since it was written, else from the raw NRS data
+    if _band_h_cache_is_current(data_dir):
+        constituency_data = pd.read_csv(
+            data_dir / BAND_H_CACHE_FILE, dtype=BAND_H_CACHE_DTYPES
+        )
+    else:
+        constituency_data = aggregate_band_h_by_constituency(data_dir)
 
     # Load constituency names
-    names = pd.read_csv(data_dir / "constituency_names.csv")
+    names = pd.read_csv(
+        data_dir / "constituency_names.csv",
+        usecols=["Code", "Name"],
+        dtype={"Code": "string", "Name": "string"},
+    )
     name_lookup = dict(zip(names["Code"], names["Name"]))
 
     # Build output
-    results = []
-    for _, row in constituency_data.iterrows():
-        name = name_lookup.get(row["ConstituencyCode"], row["ConstituencyCode"])
-        total = int(row["TotalDwellings"])
-        band_h = int(row["BandH"])
-        pct = (band_h / total * 100) if total > 0 else 0
-        council = CONSTITUENCY_COUNCIL_MAPPING.get(name, "Unknown")
-        results.append({
-            "constituency": name,
-            "council": council,
-            "band_h_properties": band_h,
-            "total_dwellings": total,
-            "pct_band_h": round(pct, 4)
-        })
-
-    out_df = pd.DataFrame(results)
+    codes = constituency_data["ConstituencyCode"].astype("string")
+    out_df = pd.DataFrame({
+        "constituency": codes.map(name_lookup).fillna(codes),
+        "band_h_properties": constituency_data["BandH"].astype(int),
+        "total_dwellings": constituency_data["TotalDwellings"].astype(int),
+    })
+    out_df = out_df.merge(_CONSTITUENCY_COUNCIL_DF, on="constituency", how="left")
+    council = out_df.pop("council").cat.add_categories(["Unknown"]).fillna("Unknown")
+    out_df.insert(1, "council", council)
+    total = out_df["total_dwellings"]
+    out_df["pct_band_h"] = np.where(
+        total > 0, (out_df["band_h_properties"] / total * 100).round(4), 0.0
+    )
     out_df = out_df.sort_values("pct_band_h", ascending=False)
 
     if verbose:
@@ -196,8 +319,9 @@ def generate_band_h_csv(
         print(f"Scotland average: {total_band_h / total_dwellings * 100:.2f}%")
         print()
         print("Top 5 by % Band H:")
-        for _, row in out_df.head(5).iterrows():
-            print(f"  {row['constituency']}: {row['pct_band_h']:.2f}%")
+        top5 = out_df.head(5)[["constituency", "pct_band_h"]]
+        for constituency, pct in top5.itertuples(index=False, name=None):
+            print(f"  {constituency}: {pct:.2f}%")
 
     if output_path:
         out_df.to_csv(output_path, index=False)
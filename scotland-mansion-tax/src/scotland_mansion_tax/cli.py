@@ -3,6 +3,7 @@ Command-line interface for Scotland Mansion Tax analysis.
 
 Usage:
     scotland-mansion-tax download --all
+    scotland-mansion-tax build-cache
     scotland-mansion-tax analyze --output results.csv
     scotland-mansion-tax visualize --input results.csv --output-dir ./output
 """
@@ -74,6 +75,29 @@ def download(download_all: bool, council_tax: bool, data_dir: Path):
         raise SystemExit(1)
 
 
+@main.command("build-cache")
+@click.option(
+    "--data-dir",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Directory containing downloaded NRS data files",
+)
+def build_cache(data_dir: Path):
+    """Precompute Band H totals by constituency from the NRS data.
+
+    Writes band_h_by_constituency.csv to the data directory so later runs
+    skip the dwelling workbook parse and Data Zone merge.
+    """
+    from scotland_mansion_tax.analysis import build_band_h_cache
+
+    try:
+        build_band_h_cache(data_dir)
+    except FileNotFoundError as e:
+        click.echo(f"❌ Error: {e}")
+        click.echo("\nRun 'scotland-mansion-tax download --all' to download required data.")
+        raise SystemExit(1)
+
+
 @main.command()
 @click.option(
     "--output",
@@ -265,9 +265,9 @@ def load_wealth_factors(
     # Merge and aggregate to constituency level
     merged = dz_data.merge(lookup, on="DataZone", how="left")
 
-    constituency_data = merged.groupby("ConstituencyCode").agg(
-        {"TotalDwellings": "sum", "BandH": "sum"}
-    ).reset_index()
+    constituency_data = merged.groupby(
+        "ConstituencyCode", sort=False, observed=True
+    ).agg({"TotalDwellings": "sum", "BandH": "sum"}).reset_index()
 
     # Calculate Scotland averages and wealth factors
     scotland_band_h = constituency_data["BandH"].sum()
@@ -289,10 +289,10 @@ def load_wealth_factors(
 
     # Calculate wealth factors (keyed by constituency NAME for compatibility with analysis.py)
     wealth_factors = {}
-    for _, row in constituency_data.iterrows():
-        pct = row["BandH"] / row["TotalDwellings"] if row["TotalDwellings"] > 0 else 0
+    rows = constituency_data[["ConstituencyCode", "TotalDwellings", "BandH"]]
+    for code, total, band_h in rows.itertuples(index=False, name=None):
+        pct = band_h / total if total > 0 else 0
         factor = pct / scotland_avg_pct if scotland_avg_pct > 0 else 1.0
-        code = row["ConstituencyCode"]
         # Use name if available, fall back to code
         name = name_lookup.get(code, code)
         wealth_factors[name] = round(factor, 2)
@@ -349,13 +349,17 @@ def load_population_data(data_dir: Path = None, verbose: bool = True) -> pd.Data
         if xlsx_file.exists():
             if verbose:
                 print("   Extracting from NRS Excel file...")
-            df = pd.read_excel(xlsx_file, sheet_name="2021", skiprows=2)
-            df.columns = ["constituency", "code", "sex", "total"] + [
-                f"age_{i}" for i in range(len(df.columns) - 4)
-            ]
-            df_pop = df[df["sex"] == "Persons"][["constituency", "total"]].copy()
+            # Only the first four columns are needed; skip the single-year-of-age columns
+            df = pd.read_excel(
+                xlsx_file,
+                sheet_name="2021",
+                skiprows=2,
+                usecols=[0, 1, 2, 3],
+                names=["constituency", "code", "sex", "total"],
+                engine="openpyxl",
+            )
+            df_pop = df.loc[df["sex"] == "Persons", ["constituency", "total"]].dropna()
             df_pop.columns = ["constituency", "population"]
-            df_pop = df_pop.dropna()
             df_pop["population"] = df_pop["population"].astype(int)
             df_pop.to_csv(pop_file, index=False)
             if verbose:
@@ -8,12 +8,235 @@ Generates:
 4. Edinburgh constituency breakdown
 """
 
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+# Serialize figures for write_html/to_html with orjson when it is installed
+if importlib.util.find_spec("orjson") is not None:
+    pio.json.config.default_engine = "orjson"
+
+# Same plotly.js build that write_html(include_plotlyjs="cdn") references
+PLOTLY_CDN_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+# Section headings for figures embedded in the HTML report, by output key
+REPORT_CHART_TITLES = {
+    "bar_chart": "Revenue by Constituency",
+    "council_breakdown": "Revenue by Council Area",
+    "edinburgh_breakdown": "Edinburgh Constituencies",
+}
+
+# Single-pass HTML escaping for text columns interpolated into the report
+HTML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Static page head and stylesheet of the HTML report
+REPORT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Scottish Mansion Tax - Parliament Constituency Analysis</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #2E86AB 0%, #1A535C 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+        }
+        h1 { margin: 0 0 10px 0; font-size: 28px; }
+        .subtitle { opacity: 0.9; font-size: 16px; }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .stat-card {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            text-align: center;
+        }
+        .stat-value { font-size: 32px; font-weight: bold; color: #2E86AB; }
+        .stat-label { color: #666; margin-top: 5px; }
+        .section {
+            background: white;
+            padding: 25px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            margin-bottom: 20px;
+        }
+        h2 { color: #1A535C; border-bottom: 2px solid #4ECDC4; padding-bottom: 10px; }
+        table { width: 100%; border-collapse: collapse; margin-top: 15px; }
+        th { background: #2E86AB; color: white; padding: 12px; text-align: left; }
+        td { padding: 10px 12px; border-bottom: 1px solid #e0e0e0; }
+        tr:hover { background: #f8f9fa; }
+        .highlight { background: #e3f2fd; }
+        .policy-box {
+            background: #f8f9fa;
+            border-left: 4px solid #4ECDC4;
+            padding: 15px;
+            margin: 20px 0;
+        }
+        .footer { text-align: center; color: #666; padding: 20px; font-size: 14px; }
+    </style>"""
+
+# Page header and summary stat cards, filled with str.format_map
+REPORT_STATS_TEMPLATE = """
+</head>
+<body>
+    <div class="header">
+        <h1>Scottish Mansion Tax Impact Analysis</h1>
+        <div class="subtitle">By Scottish Parliament Constituency (2021 Boundaries)</div>
+    </div>
+
+    <div class="stats-grid">
+        <div class="stat-card">
+            <div class="stat-value">£{total_revenue_m:.1f}m</div>
+            <div class="stat-label">Total Estimated Revenue</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{total_sales:.0f}</div>
+            <div class="stat-label">Estimated £1m+ Sales/Year</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{constituencies_with_impact}</div>
+            <div class="stat-label">Constituencies Affected</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{edinburgh_share:.0f}%</div>
+            <div class="stat-label">Edinburgh Share</div>
+        </div>
+    </div>
+
+"""
+
+# Policy overview section of the HTML report
+REPORT_POLICY_SECTION = """    <div class="section">
+        <h2>Policy Overview</h2>
+        <div class="policy-box">
+            <strong>Scottish Budget 2026-27 Council Tax Reform</strong><br><br>
+            <ul>
+                <li><strong>Effective:</strong> 1 April 2028</li>
+                <li><strong>New Band I:</strong> Properties £1m-£2m</li>
+                <li><strong>New Band J:</strong> Properties £2m+</li>
+                <li><strong>Expected revenue:</strong> £16 million annually</li>
+            </ul>
+        </div>
+    </div>
+
+"""
+
+# Opening of the top constituencies table
+REPORT_TABLE_HEADER = """    <div class="section">
+        <h2>Top 20 Constituencies by Impact</h2>
+        <table>
+            <tr>
+                <th>Rank</th>
+                <th>Constituency</th>
+                <th>Council Area</th>
+                <th>Est. Sales</th>
+                <th>Revenue</th>
+                <th>Share</th>
+            </tr>
+"""
+
+# One row of the top constituencies table in iter_html_report
+REPORT_ROW_TEMPLATE = """            <tr{highlight}>
+                <td>{rank}</td>
+                <td><strong>{constituency}</strong></td>
+                <td>{council}</td>
+                <td>{sales}</td>
+                <td>{revenue}</td>
+                <td>{share}</td>
+            </tr>
+"""
+
+# Report page below the top-20 rows
+REPORT_FOOTER = """        </table>
+    </div>
+
+    <div class="section">
+        <h2>Methodology</h2>
+        <p>This analysis distributes council-level mansion tax estimates to Scottish Parliament
+        constituencies using <strong>wealth-adjusted allocation</strong>:</p>
+        <ul>
+            <li>Council-level £1m+ property sales data from Registers of Scotland (391 sales)</li>
+            <li>Constituency-to-council geographic mapping (2021 boundaries)</li>
+            <li>Population weights from NRS Scottish Parliamentary Constituency Estimates</li>
+            <li><strong>Wealth factors</strong> from Council Tax Band F-H data (statistics.gov.scot)</li>
+        </ul>
+        <p>Within each council, revenue is allocated using:
+        <code>Weight = (Population × Wealth Factor) / Council Total</code></p>
+    </div>
+
+    <div class="footer">
+        Analysis based on Scottish Government Budget 2026-27 proposals<br>
+        Data: Registers of Scotland | Scottish Parliament 2021 boundaries
+    </div>
+</body>
+</html>"""
+
+
+@dataclass(frozen=True)
+class AnalysisViews:
+    """Slices and totals of the analysis results shared by the charts and report.
+
+    Build once with ``AnalysisViews.from_df`` and pass to each chart function
+    so the Edinburgh filter, council aggregate and totals are computed once.
+    """
+
+    edinburgh_mask: np.ndarray
+    edinburgh_df: pd.DataFrame
+    council_df: pd.DataFrame
+    total_revenue: float
+    total_sales: float
+    constituencies_with_impact: int
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "AnalysisViews":
+        """Compute the shared views of an analysis results DataFrame."""
+        edinburgh_mask = df["council"].eq("City of Edinburgh").to_numpy()
+        return cls(
+            edinburgh_mask=edinburgh_mask,
+            edinburgh_df=df[edinburgh_mask],
+            council_df=_aggregate_by_council(df),
+            total_revenue=df["allocated_revenue"].sum(),
+            total_sales=df["estimated_sales"].sum(),
+            constituencies_with_impact=int(df["estimated_sales"].gt(0).sum()),
+        )
+
+
+def _aggregate_by_council(df: pd.DataFrame) -> pd.DataFrame:
+    """Sum sales, revenue and share for each council, largest revenue first.
+
+    Ties on revenue are broken by council name.
+    """
+    return df.groupby("council", sort=False, observed=True, as_index=False).agg(
+        estimated_sales=("estimated_sales", "sum"),
+        allocated_revenue=("allocated_revenue", "sum"),
+        share_pct=("share_pct", "sum"),
+    ).sort_values(
+        ["allocated_revenue", "council"],
+        ascending=[False, True],
+        ignore_index=True,
+    )
 
 
 def create_bar_chart(df: pd.DataFrame, top_n: int = 25) -> go.Figure:
@@ -27,8 +250,7 @@ def create_bar_chart(df: pd.DataFrame, top_n: int = 25) -> go.Figure:
         Plotly Figure object
     """
     # Get top constituencies by impact
-    top_df = df.head(top_n).copy()
-    top_df = top_df.sort_values("allocated_revenue", ascending=True)
+    top_df = df.head(top_n).sort_values("allocated_revenue", ascending=True)
 
     fig = go.Figure()
 
@@ -38,7 +260,7 @@ def create_bar_chart(df: pd.DataFrame, top_n: int = 25) -> go.Figure:
             x=top_df["allocated_revenue"] / 1e6,
             orientation="h",
             marker_color="#2E86AB",
-            text=[f"£{v/1e6:.2f}m" for v in top_df["allocated_revenue"]],
+            texttemplate="£%{x:.2f}m",
             textposition="outside",
             hovertemplate=(
                 "<b>%{y}</b><br>"
@@ -47,7 +269,7 @@ def create_bar_chart(df: pd.DataFrame, top_n: int = 25) -> go.Figure:
                 "Revenue: £%{x:.2f}m<br>"
                 "<extra></extra>"
             ),
-            customdata=top_df[["council", "estimated_sales"]].values,
+            customdata=top_df[["council", "estimated_sales"]].to_numpy(),
         )
     )
 
@@ -77,55 +299,34 @@ def create_bar_chart(df: pd.DataFrame, top_n: int = 25) -> go.Figure:
     return fig
 
 
-def create_council_breakdown_chart(df: pd.DataFrame) -> go.Figure:
+def create_council_breakdown_chart(
+    df: pd.DataFrame, views: Optional[AnalysisViews] = None
+) -> go.Figure:
     """Create pie chart showing council-level breakdown.
 
     Args:
         df: Analysis results DataFrame
+        views: Precomputed views of df; the council aggregate is reused if given
 
     Returns:
         Plotly Figure object
     """
-    # Aggregate by council
-    council_df = (
-        df.groupby("council")
-        .agg(
-            {
-                "estimated_sales": "sum",
-                "allocated_revenue": "sum",
-                "share_pct": "sum",
-            }
-        )
-        .reset_index()
-    )
-    council_df = council_df.sort_values("allocated_revenue", ascending=False)
+    council_df = views.council_df if views is not None else _aggregate_by_council(df)
 
     # Top councils + "Other"
     top_councils = council_df.head(10)
-    other_revenue = (
-        council_df.iloc[10:]["allocated_revenue"].sum() if len(council_df) > 10 else 0
-    )
+    other_revenue = council_df["allocated_revenue"].iloc[10:].sum()
 
+    labels = top_councils["council"].tolist()
+    values = top_councils["allocated_revenue"].tolist()
     if other_revenue > 0:
-        other_row = pd.DataFrame(
-            [
-                {
-                    "council": "Other councils",
-                    "allocated_revenue": other_revenue,
-                    "estimated_sales": council_df.iloc[10:]["estimated_sales"].sum(),
-                }
-            ]
-        )
-        plot_df = pd.concat([top_councils, other_row], ignore_index=True)
-    else:
-        plot_df = top_councils
-
-    fig = px.pie(
-        plot_df,
-        values="allocated_revenue",
-        names="council",
+        labels.append("Other councils")
+        values.append(other_revenue)
+
+    fig = go.Figure(go.Pie(labels=labels, values=values))
+    fig.update_layout(
         title="Mansion Tax Revenue Distribution by Council Area",
-        color_discrete_sequence=px.colors.qualitative.Set3,
+        piecolorway=px.colors.qualitative.Set3,
     )
 
     fig.update_traces(
@@ -144,17 +345,23 @@ def create_council_breakdown_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_edinburgh_breakdown(df: pd.DataFrame) -> go.Figure:
+def create_edinburgh_breakdown(
+    df: pd.DataFrame, views: Optional[AnalysisViews] = None
+) -> go.Figure:
     """Create detailed Edinburgh constituency breakdown.
 
     Args:
         df: Analysis results DataFrame
+        views: Precomputed views of df; the Edinburgh slice is reused if given
 
     Returns:
-        Plotly Figure object
+        Plotly Figure object, empty if df has no Edinburgh constituencies
     """
-    edinburgh_df = df[df["council"] == "City of Edinburgh"].copy()
-    edinburgh_df = edinburgh_df.sort_values("allocated_revenue", ascending=True)
+    if views is None:
+        views = AnalysisViews.from_df(df)
+    if views.edinburgh_df.empty:
+        return go.Figure()
+    edinburgh_df = views.edinburgh_df.sort_values("allocated_revenue", ascending=True)
 
     fig = go.Figure()
 
@@ -171,20 +378,15 @@ def create_edinburgh_breakdown(df: pd.DataFrame) -> go.Figure:
                 "#95E1D3",
                 "#F38181",
             ],
-            text=[
-                f"£{v/1e6:.2f}m ({s:.0f} sales)"
-                for v, s in zip(
-                    edinburgh_df["allocated_revenue"], edinburgh_df["estimated_sales"]
-                )
-            ],
+            texttemplate="£%{x:.2f}m (%{customdata[0]:.0f} sales)",
             textposition="outside",
             hovertemplate=(
                 "<b>%{y}</b><br>"
-                "Est. sales: %{customdata:.1f}<br>"
+                "Est. sales: %{customdata[0]:.1f}<br>"
                 "Revenue: £%{x:.2f}m<br>"
                 "<extra></extra>"
             ),
-            customdata=edinburgh_df["estimated_sales"],
+            customdata=edinburgh_df[["estimated_sales"]].to_numpy(),
         )
     )
 
@@ -213,172 +415,123 @@ def create_edinburgh_breakdown(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_html_report(df: pd.DataFrame) -> str:
-    """Create comprehensive HTML report.
+def embed_figure(fig: go.Figure, div_id: str) -> str:
+    """Render a figure as a bare div for a page that loads plotly.js itself.
 
     Args:
-        df: Analysis results DataFrame
+        fig: Plotly figure
+        div_id: Stable id for the chart's div
 
     Returns:
-        HTML string
+        HTML fragment
     """
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
+
+
+def iter_html_report(
+    df: pd.DataFrame,
+    figures: Optional[Dict[str, go.Figure]] = None,
+    views: Optional[AnalysisViews] = None,
+) -> Iterator[str]:
+    """Generate the comprehensive HTML report section by section.
+
+    Args:
+        df: Analysis results DataFrame
+        figures: Optional charts to embed, keyed as in REPORT_CHART_TITLES.
+            The report then loads plotly.js once from the CDN.
+        views: Precomputed views of df; totals and the Edinburgh slice are
+            reused if given
+
+    Yields:
+        Consecutive chunks of the HTML document
+    """
+    if views is None:
+        views = AnalysisViews.from_df(df)
+    figures = figures or {}
+    plotly_script = (
+        f'\n    <script src="{PLOTLY_CDN_URL}"></script>' if figures else ""
+    )
+
     # Calculate summary stats
-    total_revenue = df["allocated_revenue"].sum()
-    total_sales = df["estimated_sales"].sum()
-    constituencies_with_impact = len(df[df["estimated_sales"] > 0])
+    total_revenue = views.total_revenue
+    total_sales = views.total_sales
+    constituencies_with_impact = views.constituencies_with_impact
 
-    edinburgh_df = df[df["council"] == "City of Edinburgh"]
-    edinburgh_revenue = edinburgh_df["allocated_revenue"].sum()
+    edinburgh_revenue = views.edinburgh_df["allocated_revenue"].sum()
     edinburgh_share = edinburgh_revenue / total_revenue * 100
 
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Scottish Mansion Tax - Parliament Constituency Analysis</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #2E86AB 0%, #1A535C 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }}
-        h1 {{ margin: 0 0 10px 0; font-size: 28px; }}
-        .subtitle {{ opacity: 0.9; font-size: 16px; }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-        .stat-value {{ font-size: 32px; font-weight: bold; color: #2E86AB; }}
-        .stat-label {{ color: #666; margin-top: 5px; }}
-        .section {{
-            background: white;
-            padding: 25px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }}
-        h2 {{ color: #1A535C; border-bottom: 2px solid #4ECDC4; padding-bottom: 10px; }}
-        table {{ width: 100%; border-collapse: collapse; margin-top: 15px; }}
-        th {{ background: #2E86AB; color: white; padding: 12px; text-align: left; }}
-        td {{ padding: 10px 12px; border-bottom: 1px solid #e0e0e0; }}
-        tr:hover {{ background: #f8f9fa; }}
-        .highlight {{ background: #e3f2fd; }}
-        .policy-box {{
-            background: #f8f9fa;
-            border-left: 4px solid #4ECDC4;
-            padding: 15px;
-            margin: 20px 0;
-        }}
-        .footer {{ text-align: center; color: #666; padding: 20px; font-size: 14px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Scottish Mansion Tax Impact Analysis</h1>
-        <div class="subtitle">By Scottish Parliament Constituency (2021 Boundaries)</div>
-    </div>
+    stats = REPORT_STATS_TEMPLATE.format_map(
+        {
+            "total_revenue_m": total_revenue / 1e6,
+            "total_sales": total_sales,
+            "constituencies_with_impact": constituencies_with_impact,
+            "edinburgh_share": edinburgh_share,
+        }
+    )
 
-    <div class="stats-grid">
-        <div class="stat-card">
-            <div class="stat-value">£{total_revenue/1e6:.1f}m</div>
-            <div class="stat-label">Total Estimated Revenue</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-value">{total_sales:.0f}</div>
-            <div class="stat-label">Estimated £1m+ Sales/Year</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-value">{constituencies_with_impact}</div>
-            <div class="stat-label">Constituencies Affected</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-value">{edinburgh_share:.0f}%</div>
-            <div class="stat-label">Edinburgh Share</div>
-        </div>
-    </div>
+    top_df = df.head(20)
+    top_cells = pd.DataFrame(
+        {
+            "highlight": np.where(
+                views.edinburgh_mask[: len(top_df)], ' class="highlight"', ""
+            ),
+            "constituency": top_df["constituency"].astype(str).str.translate(HTML_ESCAPES),
+            "council": top_df["council"].astype(str).str.translate(HTML_ESCAPES),
+            "sales": top_df["estimated_sales"].map(str),
+            "revenue": (top_df["allocated_revenue"] / 1e6).map("£{:.2f}m".format),
+            "share": top_df["share_pct"].map("{:.1f}%".format),
+        }
+    )
 
-    <div class="section">
-        <h2>Policy Overview</h2>
-        <div class="policy-box">
-            <strong>Scottish Budget 2026-27 Council Tax Reform</strong><br><br>
-            <ul>
-                <li><strong>Effective:</strong> 1 April 2028</li>
-                <li><strong>New Band I:</strong> Properties £1m-£2m</li>
-                <li><strong>New Band J:</strong> Properties £2m+</li>
-                <li><strong>Expected revenue:</strong> £16 million annually</li>
-            </ul>
-        </div>
+    yield REPORT_HEAD
+    yield plotly_script
+    yield stats
+    yield REPORT_POLICY_SECTION
+    for key, fig in figures.items():
+        yield f"""    <div class="section">
+        <h2>{REPORT_CHART_TITLES[key]}</h2>
+        {embed_figure(fig, key.replace("_", "-"))}
     </div>
 
-    <div class="section">
-        <h2>Top 20 Constituencies by Impact</h2>
-        <table>
-            <tr>
-                <th>Rank</th>
-                <th>Constituency</th>
-                <th>Council Area</th>
-                <th>Est. Sales</th>
-                <th>Revenue</th>
-                <th>Share</th>
-            </tr>
 """
-
-    for i, (_, row) in enumerate(df.head(20).iterrows(), 1):
-        highlight = (
-            ' class="highlight"' if row["council"] == "City of Edinburgh" else ""
+    yield REPORT_TABLE_HEADER
+    for rank, (highlight, constituency, council, sales, revenue, share) in enumerate(
+        top_cells.itertuples(index=False, name=None), 1
+    ):
+        yield REPORT_ROW_TEMPLATE.format(
+            rank=rank,
+            highlight=highlight,
+            constituency=constituency,
+            council=council,
+            sales=sales,
+            revenue=revenue,
+            share=share,
         )
-        html += f"""            <tr{highlight}>
-                <td>{i}</td>
-                <td><strong>{row['constituency']}</strong></td>
-                <td>{row['council']}</td>
-                <td>{row['estimated_sales']}</td>
-                <td>£{row['allocated_revenue']/1e6:.2f}m</td>
-                <td>{row['share_pct']:.1f}%</td>
-            </tr>
-"""
+    yield REPORT_FOOTER
 
-    html += """        </table>
-    </div>
 
-    <div class="section">
-        <h2>Methodology</h2>
-        <p>This analysis distributes council-level mansion tax estimates to Scottish Parliament
-        constituencies using <strong>wealth-adjusted allocation</strong>:</p>
-        <ul>
-            <li>Council-level £1m+ property sales data from Registers of Scotland (391 sales)</li>
-            <li>Constituency-to-council geographic mapping (2021 boundaries)</li>
-            <li>Population weights from NRS Scottish Parliamentary Constituency Estimates</li>
-            <li><strong>Wealth factors</strong> from Council Tax Band F-H data (statistics.gov.scot)</li>
-        </ul>
-        <p>Within each council, revenue is allocated using:
-        <code>Weight = (Population × Wealth Factor) / Council Total</code></p>
-    </div>
+def create_html_report(
+    df: pd.DataFrame,
+    figures: Optional[Dict[str, go.Figure]] = None,
+    views: Optional[AnalysisViews] = None,
+) -> str:
+    """Create comprehensive HTML report.
+
+    Args:
+        df: Analysis results DataFrame
+        figures: Optional charts to embed, keyed as in REPORT_CHART_TITLES
+        views: Precomputed views of df
+
+    Returns:
+        HTML string
+    """
+    return "".join(iter_html_report(df, figures, views))
 
-    <div class="footer">
-        Analysis based on Scottish Government Budget 2026-27 proposals<br>
-        Data: Registers of Scotland | Scottish Parliament 2021 boundaries
-    </div>
-</body>
-</html>"""
 
-    return html
+def _write_chunks(path: Path, chunks: Iterable[str]) -> None:
+    """Write text chunks to path through a single buffered file handle."""
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(chunks)
 
 
 def generate_all_visualizations(
@@ -402,22 +555,58 @@ def generate_all_visualizations(
     output_dir.mkdir(exist_ok=True)
 
     outputs = {}
+    # Categorical names make the Edinburgh mask and council groupby cheaper
+    df = df.astype({"constituency": "category", "council": "category"})
+    views = AnalysisViews.from_df(df)
 
     if verbose:
         print("Generating visualizations...")
 
-    # Bar chart
     bar_fig = create_bar_chart(df)
+    council_fig = create_council_breakdown_chart(df, views)
+    edin_fig = create_edinburgh_breakdown(df, views)
+    report_chunks = iter_html_report(
+        df,
+        figures={
+            "bar_chart": bar_fig,
+            "council_breakdown": council_fig,
+            "edinburgh_breakdown": edin_fig,
+        },
+        views=views,
+    )
+
+    # The outputs are independent, so write them concurrently
     bar_path = output_dir / "mansion_tax_bar_chart.html"
-    bar_fig.write_html(str(bar_path))
+    png_path = output_dir / "mansion_tax_bar_chart.png"
+    council_path = output_dir / "mansion_tax_council_breakdown.html"
+    edin_path = output_dir / "mansion_tax_edinburgh.html"
+    report_path = output_dir / "mansion_tax_report.html"
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        writes = {
+            "bar_chart": executor.submit(
+                bar_fig.write_html, str(bar_path), include_plotlyjs="cdn", validate=False
+            ),
+            "bar_chart_png": executor.submit(
+                bar_fig.write_image, str(png_path), width=1000, height=800
+            ),
+            "council_breakdown": executor.submit(
+                council_fig.write_html, str(council_path), include_plotlyjs="cdn", validate=False
+            ),
+            "edinburgh_breakdown": executor.submit(
+                edin_fig.write_html, str(edin_path), include_plotlyjs="cdn", validate=False
+            ),
+            "html_report": executor.submit(_write_chunks, report_path, report_chunks),
+        }
+
+    # Bar chart
+    writes["bar_chart"].result()
     outputs["bar_chart"] = bar_path
     if verbose:
         print(f"   ✓ Bar chart: {bar_path}")
 
     # Try PNG export
     try:
-        png_path = output_dir / "mansion_tax_bar_chart.png"
-        bar_fig.write_image(str(png_path), width=1000, height=800)
+        writes["bar_chart_png"].result()
         outputs["bar_chart_png"] = png_path
         if verbose:
             print(f"   ✓ Bar chart PNG: {png_path}")
@@ -426,25 +615,19 @@ def generate_all_visualizations(
             print("   ⚠️ PNG export skipped (install kaleido for image export)")
 
     # Council breakdown
-    council_fig = create_council_breakdown_chart(df)
-    council_path = output_dir / "mansion_tax_council_breakdown.html"
-    council_fig.write_html(str(council_path))
+    writes["council_breakdown"].result()
     outputs["council_breakdown"] = council_path
     if verbose:
         print(f"   ✓ Council breakdown: {council_path}")
 
     # Edinburgh breakdown
-    edin_fig = create_edinburgh_breakdown(df)
-    edin_path = output_dir / "mansion_tax_edinburgh.html"
-    edin_fig.write_html(str(edin_path))
+    writes["edinburgh_breakdown"].result()
     outputs["edinburgh_breakdown"] = edin_path
     if verbose:
         print(f"   ✓ Edinburgh breakdown: {edin_path}")
 
     # HTML report
-    html_report = create_html_report(df)
-    report_path = output_dir / "mansion_tax_report.html"
-    report_path.write_text(html_report)
+    writes["html_report"].result()
     outputs["html_report"] = report_path
     if verbose:
         print(f"   ✓ HTML report: {report_path}")
@@ -0,0 +1,42 @@
+"""Tests for the constituency-level Band H cache."""
+
+import os
+
+import pandas as pd
+
+from scotland_mansion_tax import analysis
+from scotland_mansion_tax.analysis import (
+    BAND_H_CACHE_FILE,
+    BAND_H_SOURCE_FILES,
+    generate_band_h_csv,
+)
+
+
+def test_band_h_cache_rebuilt_when_nrs_data_is_newer(tmp_path, monkeypatch):
+    """The Band H cache is used only while it is newer than the NRS files."""
+    (tmp_path / "constituency_names.csv").write_text("Code,Name\nS1,Edinburgh Central\n")
+    cache_file = tmp_path / BAND_H_CACHE_FILE
+    cache_file.write_text("ConstituencyCode,TotalDwellings,BandH\nS1,100,5\n")
+    for name in BAND_H_SOURCE_FILES:
+        (tmp_path / name).write_text("")
+        os.utime(tmp_path / name, (1000, 1000))
+
+    rebuilt = pd.DataFrame({"ConstituencyCode": ["S1"], "TotalDwellings": [200], "BandH": [20]})
+    monkeypatch.setattr(analysis, "aggregate_band_h_by_constituency", lambda data_dir: rebuilt)
+
+    os.utime(cache_file, (2000, 2000))
+    assert generate_band_h_csv(tmp_path, verbose=False)["band_h_properties"].tolist() == [5]
+
+    os.utime(cache_file, (0, 0))
+    assert generate_band_h_csv(tmp_path, verbose=False)["band_h_properties"].tolist() == [20]
+
+
+def test_band_h_cache_used_without_nrs_data(tmp_path, monkeypatch):
+    """A cache with no NRS files alongside it is used as-is."""
+    (tmp_path / "constituency_names.csv").write_text("Code,Name\nS1,Edinburgh Central\n")
+    (tmp_path / BAND_H_CACHE_FILE).write_text("ConstituencyCode,TotalDwellings,BandH\nS1,100,5\n")
+    monkeypatch.setattr(analysis, "aggregate_band_h_by_constituency", None)
+
+    df = generate_band_h_csv(tmp_path, verbose=False)
+    assert df["band_h_properties"].tolist() == [5]
+    assert df["council"].tolist() == ["City of Edinburgh"]
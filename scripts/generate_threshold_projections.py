@@ -5,6 +5,8 @@ Generate projected income tax threshold values based on CPI uprating.
 Uses OBR CPI forecasts from PolicyEngine UK parameters.
 """
 
+import numpy as np
+
 # OBR CPI forecasts (from policyengine-uk/parameters/gov/economic_assumptions/yoy_growth.yaml)
 CPI_FORECASTS = {
     2027: 0.0202,  # 2.02%
@@ -22,139 +24,115 @@ HIGHER_RATE_FROZEN = 43662
 ADVANCED_RATE_FROZEN = 75000
 TOP_RATE_FROZEN = 125140
 
+# 2025-26 thresholds, the starting point of the projection tables
+BASIC_RATE_2025 = 15398
+INTERMEDIATE_RATE_2025 = 27492
+
+# CPI forecasts as percentages, for display
+CPI_PCT = {year: rate * 100 for year, rate in CPI_FORECASTS.items()}
+
+# 2026-27 uplift set in the Scottish Budget (shown instead of CPI)
+BUDGET_UPLIFT_2026 = "+7.4%"
+
+
+def uprate_with_cpi(values, years):
+    """Uprate thresholds by CPI one year at a time.
+
+    Each year's value is rounded to whole pounds before the next year's
+    uprating, matching how the published thresholds compound. All
+    thresholds are uprated together as one array.
+
+    Returns a (len(years), len(values)) int array.
+    """
+    current = np.asarray(values, dtype=float)
+    table = np.empty((len(years), len(current)), dtype=np.int64)
+    for i, year in enumerate(years):
+        current = np.round(current * (1 + CPI_FORECASTS[year]))
+        table[i] = current
+    return table
+
 
 def calculate_projections():
     """Calculate threshold projections based on CPI uprating."""
 
-    # Basic rate threshold
-    basic = {2026: BASIC_RATE_2026}
-    prev = BASIC_RATE_2026
-    for year in [2027, 2028, 2029, 2030]:
-        cpi = CPI_FORECASTS[year]
-        new_val = round(prev * (1 + cpi))
-        basic[year] = new_val
-        prev = new_val
-
-    # Intermediate rate threshold
-    intermediate = {2026: INTERMEDIATE_RATE_2026}
-    prev = INTERMEDIATE_RATE_2026
-    for year in [2027, 2028, 2029, 2030]:
-        cpi = CPI_FORECASTS[year]
-        new_val = round(prev * (1 + cpi))
-        intermediate[year] = new_val
-        prev = new_val
-
-    # Higher rate threshold (frozen through 2028-29, then CPI uprated)
-    higher = {2025: HIGHER_RATE_FROZEN, 2026: HIGHER_RATE_FROZEN, 2027: HIGHER_RATE_FROZEN, 2028: HIGHER_RATE_FROZEN}
-    prev = HIGHER_RATE_FROZEN
-    for year in [2029, 2030]:
-        cpi = CPI_FORECASTS[year]
-        new_val = round(prev * (1 + cpi))
-        higher[year] = new_val
-        prev = new_val
-
-    # Advanced rate threshold (frozen through 2028-29, then CPI uprated)
-    advanced = {2025: ADVANCED_RATE_FROZEN, 2026: ADVANCED_RATE_FROZEN, 2027: ADVANCED_RATE_FROZEN, 2028: ADVANCED_RATE_FROZEN}
-    prev = ADVANCED_RATE_FROZEN
-    for year in [2029, 2030]:
-        cpi = CPI_FORECASTS[year]
-        new_val = round(prev * (1 + cpi))
-        advanced[year] = new_val
-        prev = new_val
-
-    # Top rate threshold (frozen through 2028-29, then CPI uprated)
-    top = {2025: TOP_RATE_FROZEN, 2026: TOP_RATE_FROZEN, 2027: TOP_RATE_FROZEN, 2028: TOP_RATE_FROZEN}
-    prev = TOP_RATE_FROZEN
-    for year in [2029, 2030]:
-        cpi = CPI_FORECASTS[year]
-        new_val = round(prev * (1 + cpi))
-        top[year] = new_val
-        prev = new_val
+    # Basic and intermediate rate thresholds, CPI uprated from 2027-28
+    uprated_years = [2027, 2028, 2029, 2030]
+    table = uprate_with_cpi([BASIC_RATE_2026, INTERMEDIATE_RATE_2026], uprated_years)
+    basic = {2026: BASIC_RATE_2026, **dict(zip(uprated_years, table[:, 0].tolist()))}
+    intermediate = {2026: INTERMEDIATE_RATE_2026, **dict(zip(uprated_years, table[:, 1].tolist()))}
+
+    # Higher, advanced and top rate thresholds (frozen through 2028-29, then CPI uprated)
+    frozen_years = [2025, 2026, 2027, 2028]
+    uprated_years = [2029, 2030]
+    frozen = [HIGHER_RATE_FROZEN, ADVANCED_RATE_FROZEN, TOP_RATE_FROZEN]
+    table = uprate_with_cpi(frozen, uprated_years)
+    higher, advanced, top = (
+        {**dict.fromkeys(frozen_years, value), **dict(zip(uprated_years, column.tolist()))}
+        for value, column in zip(frozen, table.T)
+    )
 
     return basic, intermediate, higher, advanced, top
 
 
-def main():
-    basic, intermediate, higher, advanced, top = calculate_projections()
-
+def emit_console(label, series, baseline):
+    """Print a threshold's year-on-year projection table."""
     print("=" * 60)
-    print("Basic Rate Threshold Projections (CPI uprated)")
+    print(f"{label} Rate Threshold Projections (CPI uprated)")
     print("=" * 60)
     print(f"{'Year':<12} {'Threshold':<15} {'CPI':<10} {'Change':<10}")
     print("-" * 60)
-    prev = 15398  # 2025-26 baseline
+    prev = baseline
     for year in [2026, 2027, 2028, 2029, 2030]:
-        threshold = basic[year]
-        if year == 2026:
-            change = (threshold / prev - 1) * 100
-            cpi_str = "+7.4%"
-        else:
-            cpi = CPI_FORECASTS[year] * 100
-            cpi_str = f"+{cpi:.2f}%"
-            change = (threshold / prev - 1) * 100
+        threshold = series[year]
+        cpi_str = BUDGET_UPLIFT_2026 if year == 2026 else f"+{CPI_PCT[year]:.2f}%"
+        change = (threshold / prev - 1) * 100
         print(f"{year}-{year+1-2000:<5} £{threshold:,}        {cpi_str:<10} +{change:.1f}%")
         prev = threshold
 
-    print("\n")
-    print("=" * 60)
-    print("Intermediate Rate Threshold Projections (CPI uprated)")
-    print("=" * 60)
-    print(f"{'Year':<12} {'Threshold':<15} {'CPI':<10} {'Change':<10}")
-    print("-" * 60)
-    prev = 27492  # 2025-26 baseline
-    for year in [2026, 2027, 2028, 2029, 2030]:
-        threshold = intermediate[year]
-        if year == 2026:
-            change = (threshold / prev - 1) * 100
-            cpi_str = "+7.4%"
-        else:
-            cpi = CPI_FORECASTS[year] * 100
-            cpi_str = f"+{cpi:.2f}%"
-            change = (threshold / prev - 1) * 100
-        print(f"{year}-{year+1-2000:<5} £{threshold:,}        {cpi_str:<10} +{change:.1f}%")
-        prev = threshold
+
+def emit_jsx(label, series, baseline):
+    """Print a threshold's rows for the dashboard's JSX table."""
+    print(f"\n// {label} rate threshold table rows:")
+    print(f'<tr><td style={{tdStyle}}>2025-26</td><td style={{tdRightStyle}}>£{baseline:,}</td><td style={{tdCenterStyle}}>—</td></tr>')
+    print(f'<tr><td style={{tdStyle}}>2026-27</td><td style={{tdRightStyle}}>£{series[2026]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>{BUDGET_UPLIFT_2026}</td></tr>')
+    for year in [2027, 2028, 2029]:
+        print(f'<tr><td style={{tdStyle}}>{year}-{year+1-2000}</td><td style={{tdRightStyle}}>£{series[year]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>+{CPI_PCT[year]:.1f}%</td></tr>')
+    year = 2030
+    print(f'<tr><td style={{{{...tdStyle, borderBottom: "none"}}}}>{year}-{year+1-2000}</td><td style={{{{...tdRightStyle, borderBottom: "none"}}}}>£{series[year]:,}</td><td style={{{{...tdCenterStyle, borderBottom: "none", color: "#2e7d32"}}}}>+{CPI_PCT[year]:.1f}%</td></tr>')
+
+
+def main():
+    basic, intermediate, higher, advanced, top = calculate_projections()
+    uprated = [
+        ("Basic", basic, BASIC_RATE_2025),
+        ("Intermediate", intermediate, INTERMEDIATE_RATE_2025),
+    ]
+
+    for i, (label, series, baseline) in enumerate(uprated):
+        if i:
+            print("\n")
+        emit_console(label, series, baseline)
 
     print("\n")
     print("=" * 60)
     print("JSX Table Data (copy-paste ready)")
     print("=" * 60)
-
-    print("\n// Basic rate threshold table rows:")
-    print(f'<tr><td style={{tdStyle}}>2025-26</td><td style={{tdRightStyle}}>£15,398</td><td style={{tdCenterStyle}}>—</td></tr>')
-    print(f'<tr><td style={{tdStyle}}>2026-27</td><td style={{tdRightStyle}}>£{basic[2026]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>+7.4%</td></tr>')
-    for year in [2027, 2028, 2029]:
-        cpi = CPI_FORECASTS[year] * 100
-        print(f'<tr><td style={{tdStyle}}>{year}-{year+1-2000}</td><td style={{tdRightStyle}}>£{basic[year]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>+{cpi:.1f}%</td></tr>')
-    year = 2030
-    cpi = CPI_FORECASTS[year] * 100
-    print(f'<tr><td style={{{{...tdStyle, borderBottom: "none"}}}}>{year}-{year+1-2000}</td><td style={{{{...tdRightStyle, borderBottom: "none"}}}}>£{basic[year]:,}</td><td style={{{{...tdCenterStyle, borderBottom: "none", color: "#2e7d32"}}}}>+{cpi:.1f}%</td></tr>')
-
-    print("\n// Intermediate rate threshold table rows:")
-    print(f'<tr><td style={{tdStyle}}>2025-26</td><td style={{tdRightStyle}}>£27,492</td><td style={{tdCenterStyle}}>—</td></tr>')
-    print(f'<tr><td style={{tdStyle}}>2026-27</td><td style={{tdRightStyle}}>£{intermediate[2026]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>+7.4%</td></tr>')
-    for year in [2027, 2028, 2029]:
-        cpi = CPI_FORECASTS[year] * 100
-        print(f'<tr><td style={{tdStyle}}>{year}-{year+1-2000}</td><td style={{tdRightStyle}}>£{intermediate[year]:,}</td><td style={{{{...tdCenterStyle, color: "#2e7d32"}}}}>+{cpi:.1f}%</td></tr>')
-    year = 2030
-    cpi = CPI_FORECASTS[year] * 100
-    print(f'<tr><td style={{{{...tdStyle, borderBottom: "none"}}}}>{year}-{year+1-2000}</td><td style={{{{...tdRightStyle, borderBottom: "none"}}}}>£{intermediate[year]:,}</td><td style={{{{...tdCenterStyle, borderBottom: "none", color: "#2e7d32"}}}}>+{cpi:.1f}%</td></tr>')
+    for label, series, baseline in uprated:
+        emit_jsx(label, series, baseline)
 
     print("\n")
     print("=" * 60)
     print("Frozen Thresholds (freeze ends 2028-29, then CPI uprated)")
     print("=" * 60)
-
-    print(f"\nHigher rate (42%): £{HIGHER_RATE_FROZEN:,} frozen through 2028-29")
-    print(f"  2029-30: £{higher[2029]:,}")
-    print(f"  2030-31: £{higher[2030]:,}")
-
-    print(f"\nAdvanced rate (45%): £{ADVANCED_RATE_FROZEN:,} frozen through 2028-29")
-    print(f"  2029-30: £{advanced[2029]:,}")
-    print(f"  2030-31: £{advanced[2030]:,}")
-
-    print(f"\nTop rate (48%): £{TOP_RATE_FROZEN:,} frozen through 2028-29")
-    print(f"  2029-30: £{top[2029]:,}")
-    print(f"  2030-31: £{top[2030]:,}")
+    frozen = [
+        ("Higher rate (42%)", HIGHER_RATE_FROZEN, higher),
+        ("Advanced rate (45%)", ADVANCED_RATE_FROZEN, advanced),
+        ("Top rate (48%)", TOP_RATE_FROZEN, top),
+    ]
+    for label, value, series in frozen:
+        print(f"\n{label}: £{value:,} frozen through 2028-29")
+        print(f"  2029-30: £{series[2029]:,}")
+        print(f"  2030-31: £{series[2030]:,}")
 
 
 if __name__ == "__main__":
@@ -1,16 +1,24 @@
 """Scottish Budget data generation package."""
 
-# Lazy imports to avoid loading policyengine_uk on module import
-__all__ = ["generate_all_data", "get_scottish_budget_reforms"]
+import importlib
 
+# Lazy imports to avoid loading policyengine_uk on module import (PEP 562)
+_LAZY_ATTRIBUTES = {
+    "generate_all_data": "scottish_budget_data.pipeline",
+    "get_scottish_budget_reforms": "scottish_budget_data.reforms",
+}
 
-def get_scottish_budget_reforms():
-    """Get Scottish Budget reforms (lazy import)."""
-    from scottish_budget_data.reforms import get_scottish_budget_reforms
-    return get_scottish_budget_reforms()
+__all__ = list(_LAZY_ATTRIBUTES)
 
 
-def generate_all_data():
-    """Generate all data (lazy import)."""
-    from scottish_budget_data.pipeline import generate_all_data
-    return generate_all_data()
+def __getattr__(name):
+    """Import pipeline/reforms helpers on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,13 +3,34 @@
 Uses policyengine_uk locally to calculate reform impacts for all 7 reforms.
 """
 
+import copy
+import functools
+
+import numpy as np
+import pandas as pd
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from policyengine_uk import Simulation
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to Flask's json provider
+    orjson = None
+
 app = Flask(__name__)
 CORS(app)
 
+
+def fast_json(obj):
+    """Serialize a response body with orjson when it is installed."""
+    if orjson is None:
+        return jsonify(obj)
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype="application/json",
+    )
+
+
 # Scottish Budget 2026-27 policy parameters
 # Income tax thresholds (amounts ABOVE personal allowance £12,570)
 BASIC_THRESHOLD_2026 = 3_968      # £16,538 total (7.4% uplift)
@@ -45,15 +66,33 @@ def get_cpi_uprating_factor(base_year: int, target_year: int) -> float:
 
 def create_situation(inputs: dict, year: int) -> dict:
     """Create a PolicyEngine situation from inputs."""
+    situation = copy.deepcopy(_build_household(
+        year,
+        inputs.get("is_married", False),
+        inputs.get("partner_income", 0),
+        tuple(inputs.get("children_ages", [])),
+    ))
     employment_income = inputs.get("employment_income", 30000)
-    is_married = inputs.get("is_married", False)
-    partner_income = inputs.get("partner_income", 0)
-    children_ages = inputs.get("children_ages", [])
-
+    situation["people"]["adult1"]["employment_income"] = {year: employment_income}
+    return situation
+
+
+@functools.lru_cache(maxsize=256)
+def _build_household(
+    year: int,
+    is_married: bool,
+    partner_income: float,
+    children_ages: tuple,
+) -> dict:
+    """Build the household for create_situation, cached by normalized inputs.
+
+    Employment income varies on almost every request, so it is left out of
+    the cache key and added by create_situation after the deep copy; the
+    cached dict is never handed to a Simulation.
+    """
     people = {
         "adult1": {
             "age": {year: 35},
-            "employment_income": {year: employment_income},
         },
     }
     members = ["adult1"]
@@ -157,6 +196,34 @@ def disable_scp_baby_boost(sim: Simulation, year: int) -> None:
     scp_reform.in_effect.update(period=f"{year}-01-01", value=False)
 
 
+def calculate_net_income(situation: dict, year: int, *reforms) -> float:
+    """Run one simulation with the given parameter modifiers applied.
+
+    Each modifier is called as ``reform(sim, year)`` before household net
+    income is calculated.
+    """
+    sim = Simulation(situation=situation)
+    for reform in reforms:
+        reform(sim, year)
+    sim.calculate("scottish_child_payment", year)
+    return float(sim.calculate("household_net_income", year)[0])
+
+
+def warm_up(year: int = 2026) -> None:
+    """Run one default household so model loading happens at startup.
+
+    The first Simulation in a process pays for importing and parsing the
+    policyengine_uk parameter and variable trees. Doing it here moves that
+    cost out of the first /calculate request. Each request still builds
+    its own Simulation, because the reform modifiers mutate parameters in
+    place and must not leak between requests.
+
+    Called when the server starts rather than on import, so importing this
+    module stays cheap; WSGI deployments can call it from a worker startup hook.
+    """
+    calculate_net_income(create_situation({}, year), year)
+
+
 @app.route("/calculate", methods=["POST"])
 def calculate():
     """Calculate household impact from all 7 Scottish Budget reforms."""
@@ -168,100 +235,62 @@ def calculate():
 
         # === BASELINE ===
         # For proper baseline, we need to disable SCP reforms to measure their impact
-        baseline_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(baseline_sim, year)  # Use £27.15 as baseline
-        disable_scp_baby_boost(baseline_sim, year)  # Disable baby boost
-        baseline_sim.calculate("scottish_child_payment", year)
-        baseline_net = float(baseline_sim.calculate("household_net_income", year)[0])
+        baseline = (set_scp_baseline_rate, disable_scp_baby_boost)  # £27.15, no baby boost
+        baseline_net = calculate_net_income(situation, year, *baseline)
 
         impacts = {}
 
         # === 1. Basic rate threshold uplift ===
-        basic_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(basic_sim, year)
-        disable_scp_baby_boost(basic_sim, year)
-        apply_basic_rate_uplift(basic_sim, year)
-        basic_sim.calculate("scottish_child_payment", year)
-        basic_net = float(basic_sim.calculate("household_net_income", year)[0])
+        basic_net = calculate_net_income(situation, year, *baseline, apply_basic_rate_uplift)
         impacts["income_tax_basic_uplift"] = round(basic_net - baseline_net, 2)
 
         # === 2. Intermediate rate threshold uplift ===
-        intermediate_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(intermediate_sim, year)
-        disable_scp_baby_boost(intermediate_sim, year)
-        apply_intermediate_rate_uplift(intermediate_sim, year)
-        intermediate_sim.calculate("scottish_child_payment", year)
-        intermediate_net = float(intermediate_sim.calculate("household_net_income", year)[0])
+        intermediate_net = calculate_net_income(
+            situation, year, *baseline, apply_intermediate_rate_uplift
+        )
         impacts["income_tax_intermediate_uplift"] = round(intermediate_net - baseline_net, 2)
 
-        # === 3. Higher rate threshold freeze ===
-        # Freeze COSTS money (negative impact) - compare baseline (with CPI uprating) vs frozen
-        higher_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(higher_sim, year)
-        disable_scp_baby_boost(higher_sim, year)
-        apply_higher_rate_freeze(higher_sim, year)
-        higher_sim.calculate("scottish_child_payment", year)
-        higher_net = float(higher_sim.calculate("household_net_income", year)[0])
-        impacts["higher_rate_freeze"] = round(higher_net - baseline_net, 2)
-
-        # === 4. Advanced rate threshold freeze ===
-        advanced_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(advanced_sim, year)
-        disable_scp_baby_boost(advanced_sim, year)
-        apply_advanced_rate_freeze(advanced_sim, year)
-        advanced_sim.calculate("scottish_child_payment", year)
-        advanced_net = float(advanced_sim.calculate("household_net_income", year)[0])
-        impacts["advanced_rate_freeze"] = round(advanced_net - baseline_net, 2)
-
-        # === 5. Top rate threshold freeze ===
-        top_sim = Simulation(situation=situation)
-        set_scp_baseline_rate(top_sim, year)
-        disable_scp_baby_boost(top_sim, year)
-        apply_top_rate_freeze(top_sim, year)
-        top_sim.calculate("scottish_child_payment", year)
-        top_net = float(top_sim.calculate("household_net_income", year)[0])
-        impacts["top_rate_freeze"] = round(top_net - baseline_net, 2)
+        # === 3-5. Higher, advanced and top rate threshold freezes ===
+        # Freeze COSTS money (negative impact) - compare baseline (with CPI uprating) vs frozen.
+        # The 2026 freeze is already in the baseline, so there is nothing to simulate.
+        freezes = {
+            "higher_rate_freeze": apply_higher_rate_freeze,
+            "advanced_rate_freeze": apply_advanced_rate_freeze,
+            "top_rate_freeze": apply_top_rate_freeze,
+        }
+        for name, freeze in freezes.items():
+            if year < 2027:
+                impacts[name] = 0.0
+                continue
+            frozen_net = calculate_net_income(situation, year, *baseline, freeze)
+            impacts[name] = round(frozen_net - baseline_net, 2)
 
         # === 6. SCP inflation adjustment ===
         # Only applies if household receives UC/qualifying benefit
         if receives_uc:
-            scp_inf_sim = Simulation(situation=situation)
-            apply_scp_inflation(scp_inf_sim, year)  # £28.20/week
-            disable_scp_baby_boost(scp_inf_sim, year)
-            scp_inf_sim.calculate("scottish_child_payment", year)
-            scp_inf_net = float(scp_inf_sim.calculate("household_net_income", year)[0])
-            # Compare to baseline with £27.15
-            baseline_scp_sim = Simulation(situation=situation)
-            set_scp_baseline_rate(baseline_scp_sim, year)
-            disable_scp_baby_boost(baseline_scp_sim, year)
-            baseline_scp_sim.calculate("scottish_child_payment", year)
-            baseline_scp_net = float(baseline_scp_sim.calculate("household_net_income", year)[0])
-            impacts["scp_inflation"] = round(scp_inf_net - baseline_scp_net, 2)
+            # £28.20/week, compared to the £27.15 baseline
+            scp_inf_net = calculate_net_income(
+                situation, year, apply_scp_inflation, disable_scp_baby_boost
+            )
+            impacts["scp_inflation"] = round(scp_inf_net - baseline_net, 2)
         else:
             impacts["scp_inflation"] = 0.0
 
         # === 7. SCP Premium for under-ones (baby boost) ===
         # Only applies if household receives UC and has child under 1, and year >= 2027
         if receives_uc and year >= 2027:
-            baby_sim = Simulation(situation=situation)
-            apply_scp_inflation(baby_sim, year)
-            apply_scp_baby_boost(baby_sim, year)
-            baby_sim.calculate("scottish_child_payment", year)
-            baby_net = float(baby_sim.calculate("household_net_income", year)[0])
-            # Compare to reform scenario without baby boost
-            no_baby_sim = Simulation(situation=situation)
-            apply_scp_inflation(no_baby_sim, year)
-            disable_scp_baby_boost(no_baby_sim, year)
-            no_baby_sim.calculate("scottish_child_payment", year)
-            no_baby_net = float(no_baby_sim.calculate("household_net_income", year)[0])
-            impacts["scp_baby_boost"] = round(baby_net - no_baby_net, 2)
+            baby_net = calculate_net_income(
+                situation, year, apply_scp_inflation, apply_scp_baby_boost
+            )
+            # Compare to the SCP inflation scenario, which has no baby boost
+            impacts["scp_baby_boost"] = round(baby_net - scp_inf_net, 2)
         else:
             impacts["scp_baby_boost"] = 0.0
 
         # Calculate total
         total = sum(impacts.values())
 
-        return jsonify({
+        return fast_json({
             "impacts": impacts,
             "total": round(total, 2),
             "baseline_net_income": round(baseline_net, 2),
@@ -276,10 +305,24 @@ def calculate():
 
 def create_situation_with_axes(inputs: dict, year: int, earnings_count: int = 31) -> dict:
     """Create a PolicyEngine situation with axes for vectorized earnings variation."""
-    is_married = inputs.get("is_married", False)
-    partner_income = inputs.get("partner_income", 0)
-    children_ages = inputs.get("children_ages", [])
-
+    return copy.deepcopy(_build_situation_with_axes(
+        year,
+        inputs.get("is_married", False),
+        inputs.get("partner_income", 0),
+        tuple(inputs.get("children_ages", [])),
+        earnings_count,
+    ))
+
+
+@functools.lru_cache(maxsize=256)
+def _build_situation_with_axes(
+    year: int,
+    is_married: bool,
+    partner_income: float,
+    children_ages: tuple,
+    earnings_count: int,
+) -> dict:
+    """Build a situation for create_situation_with_axes, cached by normalized inputs."""
     people = {
         "adult1": {
             "age": {year: 35},
@@ -374,19 +417,16 @@ def calculate_variation():
 
         # Build results
         earnings_step = 1000  # £1k increments
-        results = []
-        for i in range(earnings_count):
-            earnings = i * earnings_step
-            income_tax_impact = float(tax_impacts[i]) + float(freeze_impacts[i])
-            scp_impact = float(scp_impacts[i]) if receives_uc else 0.0
-            results.append({
-                "earnings": earnings,
-                "income_tax": round(income_tax_impact, 2),
-                "scp": round(scp_impact, 2),
-                "total": round(income_tax_impact + scp_impact, 2),
-            })
-
-        return jsonify({"data": results})
+        income_tax_impacts = np.asarray(tax_impacts, dtype=float) + np.asarray(freeze_impacts, dtype=float)
+        scp_impacts = np.asarray(scp_impacts, dtype=float)
+        results = pd.DataFrame({
+            "earnings": np.arange(earnings_count) * earnings_step,
+            "income_tax": np.round(income_tax_impacts, 2),
+            "scp": np.round(scp_impacts, 2),
+            "total": np.round(income_tax_impacts + scp_impacts, 2),
+        }).to_dict(orient="records")
+
+        return fast_json({"data": results})
 
     except Exception as e:
         import traceback
@@ -400,4 +440,5 @@ def health():
 
 
 if __name__ == "__main__":
+    warm_up()
     app.run(host="0.0.0.0", port=5001, debug=True)
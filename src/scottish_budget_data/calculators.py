@@ -4,7 +4,10 @@ Each calculator generates a specific type of output data.
 Uses native MicroSeries from PolicyEngine - sim.calculate() returns MicroSeries with weights.
 """
 
-import microdf as mdf
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 from policyengine_uk import Microsimulation
@@ -44,16 +47,116 @@ BASELINE_MODIFIERS = {
 }
 
 
+# Per-simulation memo of sim.calculate() results, dropped with the simulation
+_CALCULATE_CACHE: "weakref.WeakKeyDictionary[Microsimulation, dict]" = weakref.WeakKeyDictionary()
+
+# Guards the module-level per-simulation caches when years run on threads
+_CACHE_LOCK = threading.Lock()
+
+
+def _sim_cache(caches: weakref.WeakKeyDictionary, sim: Microsimulation) -> dict:
+    """Get (creating if needed) sim's entry in one of the per-simulation caches."""
+    with _CACHE_LOCK:
+        return caches.setdefault(sim, {})
+
+
+def cached_calculate(sim: Microsimulation, variable: str, year: int, map_to: str = None):
+    """Return sim.calculate(variable, year, map_to=map_to), computed once per simulation.
+
+    Calculators share simulations, so the same variable is often requested
+    several times for one year. Call clear_calculate_cache(sim) after applying
+    a reform or baseline modifier to a simulation that may already be cached.
+    """
+    cache = _sim_cache(_CALCULATE_CACHE, sim)
+    key = (variable, year, map_to)
+    if key not in cache:
+        cache[key] = sim.calculate(variable, year, map_to=map_to)
+    return cache[key]
+
+
+# Per-simulation memo of Scotland masks, indices and views, keyed by (year, entity)
+_SCOTLAND_MASK_CACHE: "weakref.WeakKeyDictionary[Microsimulation, dict]" = weakref.WeakKeyDictionary()
+
+
+def _get_scotland_mask(sim: Microsimulation, year: int, map_to: str) -> np.ndarray:
+    """Get a read-only boolean mask of Scottish entities, computed once per simulation and year."""
+    masks = _sim_cache(_SCOTLAND_MASK_CACHE, sim)
+    key = (year, map_to)
+    if key not in masks:
+        country = cached_calculate(sim, "country", year, map_to=map_to)
+        mask = np.array(country) == "SCOTLAND"
+        mask.flags.writeable = False
+        masks[key] = mask
+    return masks[key]
+
+
+def _get_scotland_indices(sim: Microsimulation, year: int, map_to: str) -> np.ndarray:
+    """Get read-only positions of Scottish entities, for np.take."""
+    masks = _sim_cache(_SCOTLAND_MASK_CACHE, sim)
+    key = (year, map_to, "indices")
+    if key not in masks:
+        indices = np.flatnonzero(_get_scotland_mask(sim, year, map_to))
+        indices.flags.writeable = False
+        masks[key] = indices
+    return masks[key]
+
+
+def clear_calculate_cache(sim: Microsimulation) -> None:
+    """Drop every memoized result, Scotland mask and view for sim."""
+    with _CACHE_LOCK:
+        _CALCULATE_CACHE.pop(sim, None)
+        _SCOTLAND_MASK_CACHE.pop(sim, None)
+
+
 def get_scotland_household_mask(sim: Microsimulation, year: int) -> np.ndarray:
     """Get boolean mask for Scottish households."""
-    country = sim.calculate("country", year, map_to="household")
-    return np.array(country) == "SCOTLAND"
+    return _get_scotland_mask(sim, year, "household")
 
 
 def get_scotland_person_mask(sim: Microsimulation, year: int) -> np.ndarray:
     """Get boolean mask for Scottish persons."""
-    country = sim.calculate("country", year, map_to="person")
-    return np.array(country) == "SCOTLAND"
+    return _get_scotland_mask(sim, year, "person")
+
+
+class ScotlandView:
+    """Scottish rows of one simulation's variables for a year, gathered once.
+
+    Only holds a weak reference to the simulation, so memoizing views in
+    _SCOTLAND_MASK_CACHE does not keep simulations alive.
+    """
+
+    def __init__(self, sim: Microsimulation, year: int, scope: str):
+        self._sim = weakref.ref(sim)
+        self.year = year
+        self.scope = scope
+        self.indices = _get_scotland_indices(sim, year, scope)
+        self._arrays = {}
+
+    def get(self, variable: str) -> np.ndarray:
+        """Get the Scottish values of variable, mapped to this view's entity."""
+        if variable not in self._arrays:
+            sim = self._sim()
+            if sim is None:
+                raise ReferenceError("The simulation behind this ScotlandView no longer exists")
+            series = cached_calculate(sim, variable, self.year, map_to=self.scope)
+            values = np.take(np.asarray(series), self.indices)
+            values.flags.writeable = False
+            self._arrays[variable] = values
+        return self._arrays[variable]
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Scottish entity weights, as carried by sim.calculate()'s MicroSeries."""
+        return self.get(f"{self.scope}_weight")
+
+
+def get_scotland_view(sim: Microsimulation, year: int, scope: str) -> ScotlandView:
+    """Get the memoized ScotlandView of sim for a year and entity ("household" or "person")."""
+    views = _sim_cache(_SCOTLAND_MASK_CACHE, sim)
+    key = (year, scope, "view")
+    if key not in views:
+        views[key] = ScotlandView(sim, year, scope)
+    return views[key]
 
 
 class BudgetaryImpactCalculator:
@@ -69,53 +172,64 @@ class BudgetaryImpactCalculator:
     3. Using gov_balance would require apportioning UK-wide aggregates
 
     Uses fresh simulations per year with proper PolicyEngine Reform classes.
+    Years run one at a time by default. Setting max_workers above 1 runs
+    them on a thread pool, at the cost of two more simulations in memory
+    per concurrent year.
     """
 
-    def __init__(self, years: list[int] = None):
+    def __init__(self, years: list[int] = None, max_workers: int = 1):
         self.years = years or [2026, 2027, 2028, 2029, 2030]
+        self.max_workers = max_workers
 
     def calculate(self, reform_id: str, reform_name: str) -> list[dict]:
         """Calculate budgetary impact for all years (Scotland only).
 
         Uses fresh simulations per year with proper Reform classes.
-        sim.calculate() returns MicroSeries with weights - .sum() is weighted.
+        The change is weighted by the household weights on sim.calculate()'s MicroSeries.
 
         Returns cost in £ millions. Positive = cost to government (income gain for households).
         """
-        results = []
-
-        for year in self.years:
-            baseline = Microsimulation()
-            reformed = Microsimulation()
+        if self.max_workers <= 1:
+            return [self._one_year(reform_id, reform_name, year) for year in self.years]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._one_year, reform_id, reform_name, year)
+                for year in self.years
+            ]
+            return [future.result() for future in futures]
+
+    def _one_year(self, reform_id: str, reform_name: str, year: int) -> dict:
+        """Calculate the budgetary impact of a reform in one year."""
+        baseline = Microsimulation()
+        reformed = Microsimulation()
 
-            # Apply baseline modifier if needed (for counterfactual baselines)
-            if reform_id in BASELINE_MODIFIERS:
-                BASELINE_MODIFIERS[reform_id](baseline)
+        # Apply baseline modifier if needed (for counterfactual baselines)
+        if reform_id in BASELINE_MODIFIERS:
+            BASELINE_MODIFIERS[reform_id](baseline)
 
-            if reform_id in REFORM_APPLY_FNS:
-                REFORM_APPLY_FNS[reform_id](reformed)
+        if reform_id in REFORM_APPLY_FNS:
+            REFORM_APPLY_FNS[reform_id](reformed)
 
-            is_scotland = get_scotland_household_mask(baseline, year)
+        clear_calculate_cache(baseline)
+        clear_calculate_cache(reformed)
 
-            # sim.calculate() returns MicroSeries with weights
-            baseline_income = baseline.calculate("household_net_income", year)
-            reformed_income = reformed.calculate("household_net_income", year)
+        baseline_view = get_scotland_view(baseline, year, "household")
+        reformed_view = get_scotland_view(reformed, year, "household")
 
-            # MicroSeries subtraction preserves weights, .sum() is weighted
-            income_change = reformed_income - baseline_income
-            household_change = income_change[is_scotland].sum()
+        # Weighted sum over Scottish households as one dot product
+        income_change = reformed_view.get("household_net_income") - baseline_view.get("household_net_income")
+        household_change = np.dot(income_change, baseline_view.weights)
 
-            # Negate because household income gain = cost to government
-            impact = -household_change / 1e6
+        # Negate because household income gain = cost to government
+        impact = -household_change / 1e6
 
-            results.append({
-                "reform_id": reform_id,
-                "reform_name": reform_name,
-                "year": year,
-                "value": impact,
-            })
-
-        return results
+        return {
+            "reform_id": reform_id,
+            "reform_name": reform_name,
+            "year": year,
+            "value": impact,
+        }
 
 
 class DistributionalImpactCalculator:
@@ -133,7 +247,8 @@ class DistributionalImpactCalculator:
     ) -> list[dict]:
         """Calculate distributional impact for a single year (Scotland only).
 
-        Uses native MicroSeries from sim.calculate() - no manual weight handling.
+        Decile averages are weighted means built from np.bincount sums,
+        using the household weights carried by the MicroSeries.
         """
         baseline = Microsimulation()
         reformed = Microsimulation()
@@ -145,30 +260,36 @@ class DistributionalImpactCalculator:
         if reform_id in REFORM_APPLY_FNS:
             REFORM_APPLY_FNS[reform_id](reformed)
 
-        is_scotland = get_scotland_household_mask(baseline, year)
-
-        # sim.calculate() returns MicroSeries with weights
-        baseline_income = baseline.calculate("household_net_income", year)
-        reformed_income = reformed.calculate("household_net_income", year)
-        income_decile = baseline.calculate("household_income_decile", year)
-
-        # Filter to Scotland - MicroSeries preserves weights when filtered
-        baseline_scotland = baseline_income[is_scotland]
-        reformed_scotland = reformed_income[is_scotland]
-        income_change = reformed_scotland - baseline_scotland
-        decile_scotland = income_decile[is_scotland]
+        clear_calculate_cache(baseline)
+        clear_calculate_cache(reformed)
+
+        # Scottish households as contiguous arrays, gathered once per simulation
+        baseline_view = get_scotland_view(baseline, year, "household")
+        reformed_view = get_scotland_view(reformed, year, "household")
+        baseline_scotland = baseline_view.get("household_net_income")
+        income_change = reformed_view.get("household_net_income") - baseline_scotland
+        decile_scotland = baseline_view.get("household_income_decile")
+        weights = baseline_view.weights
+
+        # Weighted sums for every decile, one bincount pass each. Deciles
+        # outside 1-10 are clipped into bins 0 and 11, which are ignored.
+        decile_bins = decile_scotland.astype(np.int8)
+        np.clip(decile_bins, 0, 11, out=decile_bins)
+        household_counts = np.bincount(decile_bins, minlength=12)
+        weight_sums = np.bincount(decile_bins, weights=weights, minlength=12)
+        change_sums = np.bincount(decile_bins, weights=income_change * weights, minlength=12)
+        baseline_sums = np.bincount(decile_bins, weights=baseline_scotland * weights, minlength=12)
 
         results = []
         decile_labels = ["1st", "2nd", "3rd", "4th", "5th", "6th", "7th", "8th", "9th", "10th"]
 
         for decile in range(1, 11):
-            decile_mask = np.array(decile_scotland) == decile
-            if not decile_mask.any():
+            if not household_counts[decile]:
                 continue
 
-            # Use native MicroSeries - .mean() is weighted automatically
-            avg_change = income_change[decile_mask].mean()
-            avg_baseline = baseline_scotland[decile_mask].mean()
+            # Weighted means, as MicroSeries.mean() would give
+            avg_change = change_sums[decile] / weight_sums[decile]
+            avg_baseline = baseline_sums[decile] / weight_sums[decile]
             relative_change = (avg_change / avg_baseline) * 100 if avg_baseline > 0 else 0
 
             results.append({
@@ -181,8 +302,8 @@ class DistributionalImpactCalculator:
             })
 
         # Add overall average (All deciles)
-        overall_avg_change = income_change.mean()
-        overall_avg_baseline = baseline_scotland.mean()
+        overall_avg_change = change_sums.sum() / weight_sums.sum()
+        overall_avg_baseline = baseline_sums.sum() / weight_sums.sum()
         overall_relative_change = (overall_avg_change / overall_avg_baseline) * 100 if overall_avg_baseline > 0 else 0
 
         results.append({
@@ -210,54 +331,49 @@ class MetricsCalculator:
     ) -> list[dict]:
         """Calculate poverty and other summary metrics (Scotland only).
 
-        Uses native MicroSeries from sim.calculate() - no manual weight handling.
+        Rates are weighted means of the poverty flags, using the person
+        weights carried by the MicroSeries from sim.calculate().
         """
-        is_scotland = get_scotland_person_mask(baseline, year)
-
-        # Get is_child for filtering to children
-        is_child = baseline.calculate("is_child", year, map_to="person")
-        is_child_scotland = np.array(is_child[is_scotland])
-
-        def add_metric_set(
-            results: list[dict],
-            metric_prefix: str,
-            baseline_ms,  # MicroSeries
-            reformed_ms,  # MicroSeries
-            child_filter: np.ndarray = None,
-        ) -> None:
-            """Add baseline, reform, and change metrics for a given measure."""
-            if child_filter is not None:
-                # Filter to children
-                baseline_rate = baseline_ms[child_filter].mean() * 100
-                reformed_rate = reformed_ms[child_filter].mean() * 100
-            else:
-                baseline_rate = baseline_ms.mean() * 100
-                reformed_rate = reformed_ms.mean() * 100
-
-            results.append({
-                "reform_id": reform_id,
-                "reform_name": reform_name,
-                "year": year,
-                "metric": f"{metric_prefix}_baseline",
-                "value": baseline_rate,
-            })
-            results.append({
-                "reform_id": reform_id,
-                "reform_name": reform_name,
-                "year": year,
-                "metric": f"{metric_prefix}_reform",
-                "value": reformed_rate,
-            })
-            results.append({
-                "reform_id": reform_id,
-                "reform_name": reform_name,
-                "year": year,
-                "metric": f"{metric_prefix}_change",
-                "value": reformed_rate - baseline_rate,
-            })
+        # Scottish persons as contiguous arrays, gathered once per simulation
+        views = {
+            "baseline": get_scotland_view(baseline, year, "person"),
+            "reformed": get_scotland_view(reformed, year, "person"),
+        }
 
-        results = []
+        # Person and child weights, and their totals, are shared by every rate
+        person_weight = views["baseline"].weights
+        child_weight = person_weight * views["baseline"].get("is_child")
+        person_weight_total = person_weight.sum()
+        child_weight_total = child_weight.sum()
+
+        # Prefetch every poverty flag for both simulations up front, so the
+        # metric loop below only indexes already-computed rates
+        poverty_vars = [
+            f"{stem}{housing_cost}"
+            for housing_cost in ["bhc", "ahc"]
+            for stem in ["in_poverty_", "in_relative_poverty_", "in_deep_poverty_"]
+        ]
+        flag_keys = [
+            (sim_name, var)
+            for sim_name in ["baseline", "reformed"]
+            for var in poverty_vars
+        ]
+
+        # Stack the flags into one (n_flags, n_people) matrix so every rate
+        # comes out of two matrix-vector products instead of one dot each
+        flag_matrix = np.stack([
+            views[sim_name].get(var) for sim_name, var in flag_keys
+        ]).astype(person_weight.dtype, copy=False)
+        person_rates = flag_matrix @ person_weight / person_weight_total * 100
+        child_rates = flag_matrix @ child_weight / child_weight_total * 100
+        rates = {
+            key: (float(person_rate), float(child_rate))
+            for key, person_rate, child_rate in zip(flag_keys, person_rates, child_rates)
+        }
 
+        # (metric prefix, poverty variable, children only) for every rate,
+        # e.g. ("abs_bhc_child_poverty_rate", "in_poverty_bhc", True)
+        metric_sets = []
         for housing_cost in ["bhc", "ahc"]:
             for poverty_type in ["absolute", "relative"]:
                 # Construct metric prefix: e.g., "abs_bhc_" or "rel_ahc_"
@@ -271,29 +387,34 @@ class MetricsCalculator:
                     poverty_var = f"in_relative_poverty_{housing_cost}"
                     deep_poverty_var = None
 
-                # sim.calculate() returns MicroSeries with weights
-                baseline_poverty = baseline.calculate(poverty_var, year, map_to="person")
-                reformed_poverty = reformed.calculate(poverty_var, year, map_to="person")
-
-                # Filter to Scotland - MicroSeries preserves weights
-                baseline_scotland = baseline_poverty[is_scotland]
-                reformed_scotland = reformed_poverty[is_scotland]
-
-                # All persons poverty rate
-                add_metric_set(results, f"{prefix}poverty_rate", baseline_scotland, reformed_scotland)
-                # Child poverty rate
-                add_metric_set(results, f"{prefix}child_poverty_rate", baseline_scotland, reformed_scotland, is_child_scotland)
+                metric_sets.append((f"{prefix}poverty_rate", poverty_var, False))
+                metric_sets.append((f"{prefix}child_poverty_rate", poverty_var, True))
 
                 # Deep poverty (only for absolute poverty measure)
                 if deep_poverty_var:
-                    baseline_deep = baseline.calculate(deep_poverty_var, year, map_to="person")
-                    reformed_deep = reformed.calculate(deep_poverty_var, year, map_to="person")
-
-                    baseline_deep_scotland = baseline_deep[is_scotland]
-                    reformed_deep_scotland = reformed_deep[is_scotland]
-
-                    add_metric_set(results, f"{prefix}deep_poverty_rate", baseline_deep_scotland, reformed_deep_scotland)
-                    add_metric_set(results, f"{prefix}child_deep_poverty_rate", baseline_deep_scotland, reformed_deep_scotland, is_child_scotland)
+                    metric_sets.append((f"{prefix}deep_poverty_rate", deep_poverty_var, False))
+                    metric_sets.append((f"{prefix}child_deep_poverty_rate", deep_poverty_var, True))
+
+        # Baseline, reform, and change values for each measure
+        metrics = []
+        for metric_prefix, variable, children_only in metric_sets:
+            column = 1 if children_only else 0
+            baseline_rate = rates["baseline", variable][column]
+            reformed_rate = rates["reformed", variable][column]
+            metrics.append((f"{metric_prefix}_baseline", baseline_rate))
+            metrics.append((f"{metric_prefix}_reform", reformed_rate))
+            metrics.append((f"{metric_prefix}_change", reformed_rate - baseline_rate))
+
+        results = [
+            {
+                "reform_id": reform_id,
+                "reform_name": reform_name,
+                "year": year,
+                "metric": metric,
+                "value": value,
+            }
+            for metric, value in metrics
+        ]
 
         return results
 
@@ -326,11 +447,11 @@ class TwoChildLimitCalculator:
 
         for year in self.years:
             # sim.calculate() returns MicroSeries with weights
-            region = sim_without_limit.calculate("region", year, map_to="household")
+            region = cached_calculate(sim_without_limit, "region", year, map_to="household")
             scotland_mask = np.array(region) == "SCOTLAND"
 
-            uc_without_limit = sim_without_limit.calculate("universal_credit", year, map_to="household")
-            uc_with_limit = sim_with_limit.calculate("universal_credit", year, map_to="household")
+            uc_without_limit = cached_calculate(sim_without_limit, "universal_credit", year, map_to="household")
+            uc_with_limit = cached_calculate(sim_with_limit, "universal_credit", year, map_to="household")
 
             # MicroSeries subtraction preserves weights
             uc_gain = uc_without_limit - uc_with_limit
@@ -343,12 +464,12 @@ class TwoChildLimitCalculator:
             # Count affected benefit units using MicroSeries weights
             affected_benefit_units = uc_gain.weights[affected_mask].sum()
 
-            # Count affected children - need MicroSeries for calculated values
-            benunit_children = sim_without_limit.calculate("benunit_count_children", year, map_to="household")
+            # Count affected children, weighted by uc_gain's household weights
+            benunit_children = cached_calculate(sim_without_limit, "benunit_count_children", year, map_to="household")
             affected_children_per_hh = np.maximum(np.array(benunit_children) - 2, 0)
-            # Use weights from uc_gain MicroSeries (same household weights)
-            children_ms = mdf.MicroSeries(affected_children_per_hh, weights=uc_gain.weights.values)
-            total_affected_children = children_ms[affected_mask].sum()
+            total_affected_children = np.dot(
+                affected_children_per_hh[affected_mask], uc_gain.weights.values[affected_mask]
+            )
 
             results.append({
                 "year": year,
@@ -366,7 +487,7 @@ class LocalAuthorityCalculator:
     """Calculate local authority-level impacts.
 
     Note: This uses external weights from HuggingFace (not simulation weights),
-    so we need to explicitly create MicroSeries with those weights.
+    one row of household weights per local authority.
     """
 
     def calculate(
@@ -378,38 +499,36 @@ class LocalAuthorityCalculator:
         weights: np.ndarray,
         local_authority_df: pd.DataFrame,
     ) -> list[dict]:
-        """Calculate average impact for each local authority."""
-        # Get values as arrays (we use external LA weights, not simulation weights)
-        baseline_income = np.array(baseline.calculate("household_net_income", period=year, map_to="household"))
-        reform_income = np.array(reformed.calculate("household_net_income", period=year, map_to="household"))
-
-        results = []
-
-        for idx, (_, row) in enumerate(local_authority_df.iterrows()):
-            code = row["code"]
-            name = row["name"]
+        """Calculate average impact for each local authority.
 
-            if idx >= weights.shape[0]:
-                continue
-
-            la_weights = weights[idx, :]
-
-            # Use external LA weights with MicroSeries
-            baseline_ms = mdf.MicroSeries(baseline_income, weights=la_weights)
-            reform_ms = mdf.MicroSeries(reform_income, weights=la_weights)
-
-            avg_baseline = baseline_ms.mean()
-            avg_reform = reform_ms.mean()
-            avg_gain = avg_reform - avg_baseline
-            relative_change = (avg_gain / avg_baseline) * 100 if avg_baseline > 0 else 0
-
-            results.append({
+        Weighted means for all local authorities come from one matrix-vector
+        product per income array.
+        """
+        # Get values as arrays (we use external LA weights, not simulation weights)
+        baseline_income = np.array(cached_calculate(baseline, "household_net_income", year, map_to="household"))
+        reform_income = np.array(cached_calculate(reformed, "household_net_income", year, map_to="household"))
+
+        # Local authorities without a weights row are skipped. Incomes are cast
+        # to the weights' dtype so float32 weights are not upcast on every product;
+        # the gain is weighted directly so it does not cancel at that precision.
+        la_weights = weights[: len(local_authority_df)]
+        weight_sums = la_weights.sum(axis=1, dtype=np.float64)
+        avg_baseline = la_weights @ baseline_income.astype(la_weights.dtype, copy=False) / weight_sums
+        income_change = (reform_income - baseline_income).astype(la_weights.dtype, copy=False)
+        avg_gain = la_weights @ income_change / weight_sums
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_change = np.where(avg_baseline > 0, avg_gain / avg_baseline * 100, 0.0)
+
+        codes = local_authority_df["code"].to_numpy()
+        names = local_authority_df["name"].to_numpy()
+        return [
+            {
                 "reform_id": reform_id,
                 "year": year,
                 "local_authority_code": code,
                 "local_authority_name": name,
-                "average_gain": avg_gain,
-                "relative_change": relative_change,
-            })
-
-        return results
+                "average_gain": gain,
+                "relative_change": change,
+            }
+            for code, name, gain, change in zip(codes, names, avg_gain, relative_change)
+        ]
@@ -43,6 +43,20 @@ def parse_args(args: list[str] = None) -> argparse.Namespace:
         help="Only run specific reform(s) by ID (e.g., --reform scp_baby_boost)",
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse per-reform results cached in this directory (default: no cache)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Years to run in parallel for budgetary impacts; each holds two simulations (default: 1)",
+    )
+
     return parser.parse_args(args)
 
 
@@ -93,6 +107,8 @@ def main(args: list[str] = None) -> int:
             reforms=reforms,
             output_dir=parsed.output_dir,
             years=parsed.years,
+            cache_dir=parsed.cache_dir,
+            budgetary_workers=parsed.workers,
         )
         print("\n" + "=" * 50)
         print("Data generation complete!")
@@ -3,14 +3,22 @@
 This module provides the main pipeline for generating all dashboard data.
 """
 
+import hashlib
+import os
+import pickle
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import Optional
+import numpy as np
 import pandas as pd
 import h5py
 
-from huggingface_hub import hf_hub_download
+from huggingface_hub import HfApi, hf_hub_download
 from policyengine_uk import Microsimulation
 
+from . import calculators as calculators_module
+from . import reforms as reforms_module
 from .calculators import (
     BASELINE_MODIFIERS,
     BudgetaryImpactCalculator,
@@ -18,6 +26,7 @@ from .calculators import (
     DistributionalImpactCalculator,
     MetricsCalculator,
     TwoChildLimitCalculator,
+    clear_calculate_cache,
 )
 from .reforms import ReformDefinition, get_scottish_budget_reforms
 
@@ -29,6 +38,13 @@ HF_REPO = "policyengine/policyengine-uk-data"
 # Default paths
 DEFAULT_OUTPUT_DIR = Path("public/data")
 
+# Source files whose contents are part of every results cache key
+CACHE_SOURCE_FILES = (
+    Path(__file__),
+    Path(reforms_module.__file__),
+    Path(calculators_module.__file__),
+)
+
 
 def get_local_authority_files() -> tuple[str, str]:
     """Download local authority files from HuggingFace.
@@ -48,11 +64,83 @@ def save_csv(df: pd.DataFrame, csv_path: Path) -> None:
     print(f"Saved: {csv_path}")
 
 
+def load_cached_results(cache_path: Path) -> Optional[tuple]:
+    """Load one reform's pickled results, or None on a missing or truncated file."""
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (EOFError, pickle.UnpicklingError) as e:
+        print(f"Warning: Ignoring unreadable cache file {cache_path}: {e}")
+        return None
+
+
+def save_cached_results(cache_path: Path, results: tuple) -> None:
+    """Pickle one reform's results, replacing cache_path only once fully written."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(results, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def get_dataset_identifier() -> Optional[str]:
+    """Identify the microdata behind the default Microsimulation.
+
+    Combines the installed policyengine-uk and policyengine-uk-data versions
+    with the current revision of the HuggingFace data repo, so a refreshed
+    dataset changes the identifier.
+
+    Returns:
+        The identifier, or None if the revision cannot be looked up.
+    """
+    try:
+        revision = HfApi().model_info(HF_REPO).sha
+    except Exception as e:
+        print(f"Warning: Could not look up dataset revision: {e}")
+        return None
+
+    packages = []
+    for package in ["policyengine-uk", "policyengine-uk-data"]:
+        try:
+            packages.append(f"{package}=={version(package)}")
+        except PackageNotFoundError:
+            packages.append(f"{package} not installed")
+    return ";".join(packages + [f"{HF_REPO}@{revision}"])
+
+
+def reform_cache_key(
+    reform: ReformDefinition,
+    years: list[int],
+    local_authority_source: Optional[str],
+    dataset_id: str,
+) -> str:
+    """Fingerprint a reform run for the on-disk results cache.
+
+    Covers the reform ID, years, local authority files and dataset, plus the
+    source of the pipeline, reform and calculator modules, so changing any
+    of them invalidates every cached result.
+    """
+    digest = hashlib.sha256()
+    for part in (reform.id, years, local_authority_source, dataset_id):
+        digest.update(repr(part).encode())
+    for source_file in CACHE_SOURCE_FILES:
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
 def generate_all_data(
     reforms: Optional[list[ReformDefinition]] = None,
     output_dir: Optional[Path] = None,
     years: list[int] = None,
     scotland_only: bool = True,
+    cache_dir: Optional[Path] = None,
+    budgetary_workers: int = 1,
 ) -> dict[str, pd.DataFrame]:
     """Generate all dashboard data for the given reforms.
 
@@ -61,6 +149,10 @@ def generate_all_data(
         output_dir: Directory for output CSV files.
         years: Years to analyze.
         scotland_only: If True, filter to Scottish local authorities only.
+        cache_dir: If set, per-reform results are pickled here and reused on
+            later runs with the same reform, years, data and code.
+        budgetary_workers: Years to run concurrently in the budgetary impact
+            calculation. Each concurrent year holds two more simulations.
 
     Returns:
         Dict mapping output name to DataFrame.
@@ -70,7 +162,7 @@ def generate_all_data(
     years = years or [2026, 2027, 2028, 2029, 2030]
 
     # Initialize calculators
-    budgetary_calc = BudgetaryImpactCalculator(years=years)
+    budgetary_calc = BudgetaryImpactCalculator(years=years, max_workers=budgetary_workers)
     distributional_calc = DistributionalImpactCalculator()
     metrics_calc = MetricsCalculator()
     local_authority_calc = LocalAuthorityCalculator()
@@ -78,14 +170,17 @@ def generate_all_data(
     # Download local authority data from HuggingFace
     weights = None
     local_authority_df = None
+    local_authority_source = None
 
     try:
         weights_path, csv_path = get_local_authority_files()
         print(f"Downloaded local authority files from HuggingFace")
 
+        # float32 halves the memory the per-authority weighted means stream through
         with h5py.File(weights_path, "r") as f:
-            weights = f["2025"][...]
+            weights = f["2025"][...].astype(np.float32, copy=False)
         local_authority_df = pd.read_csv(csv_path)
+        local_authority_source = f"{weights_path}:{csv_path}:{scotland_only}"
 
         # Filter to Scottish local authorities if requested
         if scotland_only:
@@ -97,6 +192,14 @@ def generate_all_data(
     except Exception as e:
         print(f"Warning: Could not load local authority data: {e}")
 
+    # Cached results are only safe to reuse if the dataset can be identified
+    dataset_id = None
+    if cache_dir is not None:
+        dataset_id = get_dataset_identifier()
+        if dataset_id is None:
+            print("Warning: Results cache disabled for this run")
+            cache_dir = None
+
     # Aggregate results
     all_budgetary = []
     all_distributional = []
@@ -106,6 +209,20 @@ def generate_all_data(
     for reform in reforms:
         print(f"\nProcessing: {reform.name}")
 
+        cache_path = None
+        if cache_dir is not None:
+            key = reform_cache_key(reform, years, local_authority_source, dataset_id)
+            cache_path = Path(cache_dir) / f"{reform.id}-{key}.pkl"
+            cached = load_cached_results(cache_path)
+            if cached is not None:
+                budgetary, distributional, metrics, local_authorities = cached
+                all_budgetary.extend(budgetary)
+                all_distributional.extend(distributional)
+                all_metrics.extend(metrics)
+                all_local_authorities.extend(local_authorities)
+                print(f"  Loaded cached results: {cache_path}")
+                continue
+
         # Create simulations using HF dataset (consistent with other calculators)
         baseline = Microsimulation()
         reformed = Microsimulation()
@@ -116,32 +233,46 @@ def generate_all_data(
 
         reform.apply_fn(reformed)
 
+        clear_calculate_cache(baseline)
+        clear_calculate_cache(reformed)
+
         # Calculate budgetary impact
         budgetary = budgetary_calc.calculate(reform.id, reform.name)
-        all_budgetary.extend(budgetary)
+        distributional = []
+        metrics = []
+        local_authorities = []
 
         # Calculate per-year metrics
         for year in years:
             print(f"  Year {year}...")
 
             # Distributional
-            distributional = distributional_calc.calculate(
-                reform.id, reform.name, year
+            distributional.extend(
+                distributional_calc.calculate(reform.id, reform.name, year)
             )
-            all_distributional.extend(distributional)
 
             # Summary metrics (poverty)
-            metrics = metrics_calc.calculate(
-                baseline, reformed, reform.id, reform.name, year
+            metrics.extend(
+                metrics_calc.calculate(
+                    baseline, reformed, reform.id, reform.name, year
+                )
             )
-            all_metrics.extend(metrics)
 
             # Local authority impacts
             if weights is not None and local_authority_df is not None:
-                local_authorities = local_authority_calc.calculate(
-                    baseline, reformed, reform.id, year, weights, local_authority_df
+                local_authorities.extend(
+                    local_authority_calc.calculate(
+                        baseline, reformed, reform.id, year, weights, local_authority_df
+                    )
                 )
-                all_local_authorities.extend(local_authorities)
+
+        all_budgetary.extend(budgetary)
+        all_distributional.extend(distributional)
+        all_metrics.extend(metrics)
+        all_local_authorities.extend(local_authorities)
+
+        if cache_path is not None:
+            save_cached_results(cache_path, (budgetary, distributional, metrics, local_authorities))
 
         print(f"  Done: {reform.name}")
 
@@ -0,0 +1,150 @@
+"""Tests for the per-simulation caches in the calculators module."""
+
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+
+class StubSimulation:
+    """Minimal stand-in for Microsimulation that records calculate() calls."""
+
+    def __init__(self, values: dict):
+        self.values = values
+        self.calls = []
+
+    def calculate(self, variable, year, map_to=None):
+        self.calls.append((variable, year, map_to))
+        return np.array(self.values[variable])
+
+
+def test_cached_calculate_memoizes_per_simulation():
+    """Test that repeat requests reuse the first sim.calculate() result."""
+    from scottish_budget_data.calculators import cached_calculate
+
+    sim = StubSimulation({"household_net_income": [1.0, 2.0]})
+
+    first = cached_calculate(sim, "household_net_income", 2026)
+    second = cached_calculate(sim, "household_net_income", 2026)
+
+    assert second is first
+    assert sim.calls == [("household_net_income", 2026, None)]
+
+    cached_calculate(sim, "household_net_income", 2027)
+    assert len(sim.calls) == 2
+
+
+def test_clear_calculate_cache_drops_stale_results():
+    """Test that clearing after a modifier makes the next call recalculate."""
+    from scottish_budget_data.calculators import cached_calculate, clear_calculate_cache
+
+    sim = StubSimulation({"household_net_income": [1.0, 2.0]})
+    cached_calculate(sim, "household_net_income", 2026)
+
+    # A modifier applied after the first read changes the simulation's output
+    sim.values["household_net_income"] = [3.0, 4.0]
+    clear_calculate_cache(sim)
+
+    result = cached_calculate(sim, "household_net_income", 2026)
+    assert result.tolist() == [3.0, 4.0]
+    assert len(sim.calls) == 2
+
+
+def test_cache_entries_drop_with_simulation():
+    """Test that the cache does not keep simulations alive."""
+    from scottish_budget_data.calculators import _CALCULATE_CACHE, cached_calculate
+
+    sim = StubSimulation({"household_net_income": [1.0, 2.0]})
+    cached_calculate(sim, "household_net_income", 2026)
+    sim_ref = weakref.ref(sim)
+    assert sim in _CALCULATE_CACHE
+
+    del sim
+    gc.collect()
+
+    assert sim_ref() is None
+
+
+def _scotland_sim():
+    """Stub with four households, the 2nd and 4th in Scotland."""
+    return StubSimulation({
+        "country": ["ENGLAND", "SCOTLAND", "WALES", "SCOTLAND"],
+        "household_net_income": [10.0, 20.0, 30.0, 40.0],
+        "household_weight": [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def test_scotland_view_gathers_scottish_rows():
+    """Test that ScotlandView.get() returns only the Scottish rows, read-only."""
+    from scottish_budget_data.calculators import get_scotland_view
+
+    sim = _scotland_sim()
+    view = get_scotland_view(sim, 2026, "household")
+    income = view.get("household_net_income")
+
+    assert income.tolist() == [20.0, 40.0]
+    assert not income.flags.writeable
+
+
+def test_scotland_view_reuses_gathered_arrays():
+    """Test that views and their arrays are built once per simulation and year."""
+    from scottish_budget_data.calculators import get_scotland_view
+
+    sim = _scotland_sim()
+    view = get_scotland_view(sim, 2026, "household")
+    income = view.get("household_net_income")
+
+    assert get_scotland_view(sim, 2026, "household") is view
+    assert view.get("household_net_income") is income
+    assert sim.calls.count(("household_net_income", 2026, "household")) == 1
+
+
+def test_scotland_view_weights_use_scope_weight_variable():
+    """Test that .weights gathers the {scope}_weight variable."""
+    from scottish_budget_data.calculators import get_scotland_view
+
+    sim = _scotland_sim()
+    view = get_scotland_view(sim, 2026, "household")
+
+    assert view.weights.tolist() == [2.0, 4.0]
+    assert ("household_weight", 2026, "household") in sim.calls
+
+
+def test_scotland_view_does_not_keep_simulation_alive():
+    """Test that a view outliving its simulation raises instead of recalculating."""
+    from scottish_budget_data.calculators import get_scotland_view
+
+    view = get_scotland_view(_scotland_sim(), 2026, "household")
+    gc.collect()
+
+    with pytest.raises(ReferenceError):
+        view.get("household_net_income")
+
+
+def test_budgetary_impact_threaded_matches_serial(monkeypatch):
+    """Test that running years on threads gives the same results in year order."""
+    from scottish_budget_data import calculators
+
+    class YearlySimulation(StubSimulation):
+        """Stub whose incomes differ by year, so misordered results would show."""
+
+        def __init__(self):
+            super().__init__({})
+
+        def calculate(self, variable, year, map_to=None):
+            self.calls.append((variable, year, map_to))
+            if variable == "country":
+                return np.array(["SCOTLAND", "ENGLAND", "SCOTLAND"])
+            if variable == "household_weight":
+                return np.array([1.0, 2.0, 3.0])
+            return np.array([100.0, 200.0, 300.0]) * (year - 2025)
+
+    monkeypatch.setattr(calculators, "Microsimulation", YearlySimulation)
+    years = [2026, 2027, 2028, 2029, 2030]
+
+    serial = calculators.BudgetaryImpactCalculator(years=years).calculate("test", "Test")
+    threaded = calculators.BudgetaryImpactCalculator(years=years, max_workers=3).calculate("test", "Test")
+
+    assert threaded == serial
+    assert [row["year"] for row in threaded] == years
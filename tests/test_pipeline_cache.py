@@ -0,0 +1,101 @@
+"""Tests for the pipeline's per-reform results cache."""
+
+
+def _test_reform():
+    from scottish_budget_data.reforms import ReformDefinition
+
+    return ReformDefinition(
+        id="test",
+        name="Test Reform",
+        description="A test reform",
+        apply_fn=lambda sim: None,
+    )
+
+
+def test_reform_cache_key_changes_with_inputs(tmp_path, monkeypatch):
+    """Test that the cache key changes with the dataset and pipeline source."""
+    from scottish_budget_data import pipeline
+
+    sources = []
+    for name in ["pipeline.py", "reforms.py", "calculators.py"]:
+        source = tmp_path / name
+        source.write_text(f"# {name}\n")
+        sources.append(source)
+    monkeypatch.setattr(pipeline, "CACHE_SOURCE_FILES", tuple(sources))
+
+    reform = _test_reform()
+    key = pipeline.reform_cache_key(reform, [2026], None, "dataset@1")
+
+    assert pipeline.reform_cache_key(reform, [2026], None, "dataset@1") == key
+    assert pipeline.reform_cache_key(reform, [2026], None, "dataset@2") != key
+    assert pipeline.reform_cache_key(reform, [2026, 2027], None, "dataset@1") != key
+
+    sources[0].write_text("# pipeline.py, edited\n")
+    assert pipeline.reform_cache_key(reform, [2026], None, "dataset@1") != key
+
+
+def test_cache_hit_skips_simulation(tmp_path, monkeypatch):
+    """Test that a second run with the same key loads results without simulating."""
+    from scottish_budget_data import pipeline
+
+    class FakeCalculator:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def calculate(self, *args):
+            return [{"value": 1.0}]
+
+    def offline():
+        raise OSError("offline")
+
+    simulations = []
+
+    class FakeSimulation:
+        def __init__(self):
+            simulations.append(self)
+
+    monkeypatch.setattr(pipeline, "Microsimulation", FakeSimulation)
+    monkeypatch.setattr(pipeline, "BASELINE_MODIFIERS", {})
+    monkeypatch.setattr(pipeline, "get_dataset_identifier", lambda: "dataset@1")
+    monkeypatch.setattr(pipeline, "get_local_authority_files", offline)
+    for name in [
+        "BudgetaryImpactCalculator",
+        "DistributionalImpactCalculator",
+        "MetricsCalculator",
+        "LocalAuthorityCalculator",
+    ]:
+        monkeypatch.setattr(pipeline, name, FakeCalculator)
+
+    def run():
+        return pipeline.generate_all_data(
+            reforms=[_test_reform()],
+            output_dir=tmp_path / "out",
+            years=[2026],
+            cache_dir=tmp_path / "cache",
+        )
+
+    first = run()
+    assert len(simulations) == 2
+
+    second = run()
+    assert len(simulations) == 2
+    for name, df in first.items():
+        assert df.equals(second[name])
+
+
+def test_truncated_cache_file_is_a_miss(tmp_path):
+    """Test that a partially written cache file is ignored, then replaced whole."""
+    from scottish_budget_data import pipeline
+
+    cache_path = tmp_path / "test-key.pkl"
+    results = ([{"value": 1.0}], [], [], [])
+    pipeline.save_cached_results(cache_path, results)
+    assert pipeline.load_cached_results(cache_path) == results
+
+    cache_path.write_bytes(cache_path.read_bytes()[:10])
+    assert pipeline.load_cached_results(cache_path) is None
+    assert pipeline.load_cached_results(tmp_path / "missing.pkl") is None
+
+    pipeline.save_cached_results(cache_path, results)
+    assert pipeline.load_cached_results(cache_path) == results
+    assert [p.name for p in tmp_path.iterdir()] == ["test-key.pkl"]